@@ -3,6 +3,7 @@ from __future__ import annotations
 from typing import TYPE_CHECKING
 
 from django.db.models import QuerySet, Q
+from rest_framework.request import Request
 
 from identity.models import CoreIdentity
 
@@ -11,11 +12,22 @@ if TYPE_CHECKING:
 
 
 def _get_identity_from_request(request: "HttpRequest") -> CoreIdentity | None:
-    """Récupère l'identité depuis la requête."""
+    """
+    Récupère l'identité depuis la requête.
+
+    Mémorisée pour la durée de la requête : permissions, filtrage de scope et
+    vue la résolvent chacun, une seule requête SQL est émise par email.
+    """
     email = getattr(request.user, "email", None)
     if not email:
         return None
-    return CoreIdentity.objects.filter(email__iexact=email, is_active=True).first()
+    # Cache porté par la HttpRequest sous-jacente, partagée par les Request DRF
+    http_request = request._request if isinstance(request, Request) else request
+    cache = http_request.__dict__.setdefault("_identity_cache", {})
+    key = email.lower()
+    if key not in cache:
+        cache[key] = CoreIdentity.objects.filter(email__iexact=email, is_active=True).first()
+    return cache[key]
 
 
 def _get_scope_code(identity: CoreIdentity, role_code: str) -> str | None:
@@ -5,6 +5,8 @@ from typing import Iterable, Optional
 from django.http import HttpRequest
 from rest_framework.permissions import BasePermission, SAFE_METHODS
 
+from .mixins import _get_identity_from_request
+
 
 class ActiveRolePermission(BasePermission):
     """Permission basée sur le rôle actif injecté par middleware."""
@@ -289,7 +291,6 @@ class MoratoirePermission(ActiveRolePermission):
 
         # USER_STUDENT peut voir uniquement ses propres moratoires
         if role_active == "USER_STUDENT":
-            from .mixins import _get_identity_from_request
             identity = _get_identity_from_request(request)
             if identity and obj.student.identity_id == identity.id:
                 return request.method in SAFE_METHODS
@@ -492,12 +493,3 @@ class DemandePermission(BasePermission):
 
         return False
 
-
-def _get_identity_from_request(request: HttpRequest):
-    """Récupère l'identité depuis la requête."""
-    from identity.models import CoreIdentity
-
-    email = getattr(request.user, "email", None)
-    if not email:
-        return None
-    return CoreIdentity.objects.filter(email__iexact=email, is_active=True).first()
\ No newline at end of file
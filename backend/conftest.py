@@ -2,5 +2,74 @@ from __future__ import annotations
 
 import os
 
+import pytest
+
 os.environ.setdefault("USE_SQLITE", "1")
 os.environ.setdefault("DEBUG", "1")
+
+# Fixtures pytest-django qui rendent un test transactionnel (TRUNCATE en fin de test)
+_TRANSACTIONAL_FIXTURES = {"transactional_db", "django_db_reset_sequences", "live_server"}
+
+
+def pytest_collection_modifyitems(config, items):
+    """
+    Invariant : chaque test tourne dans une transaction annulée en fin de test.
+
+    Un test transactionnel (django_db(transaction=True), reset_sequences,
+    TransactionTestCase) vide toutes les tables par TRUNCATE après son
+    passage : il doit être justifié par @pytest.mark.transactional("raison").
+    """
+    from django.test import TestCase, TransactionTestCase
+
+    offenders = []
+    for item in items:
+        if item.get_closest_marker("transactional"):
+            continue
+        marker = item.get_closest_marker("django_db")
+        transactional = bool(
+            marker
+            and (
+                marker.kwargs.get("transaction")
+                or marker.kwargs.get("reset_sequences")
+                or any(marker.args[:2])
+            )
+        )
+        if _TRANSACTIONAL_FIXTURES & set(getattr(item, "fixturenames", ())):
+            transactional = True
+        cls = getattr(item, "cls", None)
+        if cls is not None and issubclass(cls, TransactionTestCase) and not issubclass(cls, TestCase):
+            transactional = True
+        if transactional:
+            offenders.append(item.nodeid)
+    if offenders:
+        raise pytest.UsageError(
+            "Tests transactionnels sans @pytest.mark.transactional(\"raison\") :\n"
+            + "\n".join(offenders)
+        )
+
+
+@pytest.fixture(scope="session")
+def _shared_api_client():
+    """APIClient construit une seule fois pour toute la session."""
+    from rest_framework.test import APIClient
+
+    return APIClient()
+
+
+@pytest.fixture
+def api_client(_shared_api_client):
+    """Client API partagé, désauthentifié (cookies et credentials vidés) après chaque test."""
+    yield _shared_api_client
+    # Remise à zéro sans logout() : celui-ci crée une session en base, interdit
+    # si le test n'a pas demandé l'accès à la DB
+    _shared_api_client.credentials()
+    _shared_api_client.handler._force_user = None
+    _shared_api_client.handler._force_token = None
+    _shared_api_client.cookies.clear()
+
+
+@pytest.fixture
+def instance_api_client(request, api_client):
+    """Client API partagé exposé en `self.client` aux classes de test pytest (setup_method)."""
+    request.instance.client = api_client
+    return api_client
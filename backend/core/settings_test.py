@@ -9,3 +9,6 @@ DATABASES = {
         "NAME": BASE_DIR / "test_db.sqlite3",
     }
 }
+
+# Hachage rapide : les mots de passe de test n'ont pas besoin de PBKDF2
+PASSWORD_HASHERS = ["django.contrib.auth.hashers.MD5PasswordHasher"]
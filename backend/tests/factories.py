@@ -0,0 +1,230 @@
+"""
+Fabriques partagées par les tests : données (insertion groupée via bulk_create)
+et requêtes adressées directement aux vues.
+"""
+from __future__ import annotations
+
+import json
+from datetime import date
+from itertools import count
+from typing import Any, Optional
+
+from django.contrib.auth.models import User
+from django.core.serializers.json import DjangoJSONEncoder
+from rest_framework.test import APIClient, APIRequestFactory, force_authenticate
+
+from apps.academic.models import Program, StudentProfile
+from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
+
+
+def make_user(email: str = "", username: Optional[str] = None) -> User:
+    """
+    Crée un User Django (username = email par défaut) sans passer par create_user.
+
+    Mot de passe inutilisable, posé sans hachage : les tests s'authentifient
+    via force_authenticate.
+    """
+    user = User(username=username or email, email=email)
+    user.set_unusable_password()
+    user.save()
+    return user
+
+
+# Rôles de référence des tests (code -> libellé), semés en un seul INSERT
+RBAC_ROLE_LABELS = {
+    "RECTEUR": "Recteur",
+    "DOYEN": "Doyen",
+    "ADMIN_SI": "Admin SI",
+    "USER_STUDENT": "Étudiant",
+    "USER_TEACHER": "Enseignant",
+    "VALIDATOR_ACAD": "Validateur Académique",
+    "SCOLARITE": "Scolarité",
+    "OPERATOR_FINANCE": "Opérateur Finance",
+    "MANAGER_RH_PAY": "Manager RH Pay",
+    # Rôle détenu mais sans dashboard dédié
+    "UNKNOWN_ROLE": "Unknown Role",
+}
+
+
+def seed_roles(labels: dict[str, str] = RBAC_ROLE_LABELS) -> dict[str, RbacRoleDef]:
+    """
+    Crée les rôles `code -> libellé` en un seul INSERT et les retourne indexés par code.
+
+    À appeler dans chaque setUpTestData : un cache au niveau du processus
+    garderait des rôles supprimés par le rollback de la classe précédente.
+    """
+    RbacRoleDef.objects.bulk_create(
+        [RbacRoleDef(code=code, label=label, is_active=True) for code, label in labels.items()],
+        ignore_conflicts=True,
+    )
+    return RbacRoleDef.objects.in_bulk(list(labels), field_name="code")
+
+
+class JSONClient(APIClient):
+    """
+    APIClient dont post/put/patch encodent le corps une seule fois avec
+    json.dumps, sans passer par le renderer JSON de DRF.
+
+    S'applique aux données non sérialisées envoyées sans `format` ou avec
+    `format="json"` ; un `content_type` explicite est laissé tel quel.
+    """
+
+    def _encode(self, data, format, content_type):
+        serialized = data is None or isinstance(data, (bytes, str))
+        if content_type is None and format in (None, "json") and not serialized:
+            return json.dumps(data, cls=DjangoJSONEncoder), None, "application/json"
+        return data, format, content_type
+
+    def post(self, path, data=None, format=None, content_type=None, follow=False, **extra):
+        data, format, content_type = self._encode(data, format, content_type)
+        return super().post(path, data, format, content_type, follow, **extra)
+
+    def put(self, path, data=None, format=None, content_type=None, follow=False, **extra):
+        data, format, content_type = self._encode(data, format, content_type)
+        return super().put(path, data, format, content_type, follow, **extra)
+
+    def patch(self, path, data=None, format=None, content_type=None, follow=False, **extra):
+        data, format, content_type = self._encode(data, format, content_type)
+        return super().patch(path, data, format, content_type, follow, **extra)
+
+
+# Requêtes construites sans client HTTP : ni résolution d'URL ni middlewares
+request_factory = APIRequestFactory()
+
+# Téléphones générés (champ unique) : plage distincte des numéros écrits en dur
+_phone_seq = count(1)
+
+
+class IdentityFactory:
+    """
+    Accumule des identités, utilisateurs, liens de rôle et profils étudiants non
+    sauvegardés, puis les insère avec un seul bulk_create par modèle.
+
+    Les objets retournés sont utilisables directement après `flush()` : les clés
+    primaires UUID sont générées à l'instanciation et celles des User sont
+    renseignées par bulk_create (PostgreSQL, SQLite >= 3.35).
+    """
+
+    def __init__(self) -> None:
+        self._identities: list[CoreIdentity] = []
+        self._users: list[User] = []
+        self._links: list[IdentityRoleLink] = []
+        self._profiles: list[StudentProfile] = []
+
+    def identity(
+        self,
+        email: str,
+        phone: Optional[str] = None,
+        first_name: str = "Test",
+        last_name: Optional[str] = None,
+        role: Optional[RbacRoleDef] = None,
+        metadata: Optional[dict[str, Any]] = None,
+    ) -> CoreIdentity:
+        """
+        Prépare une identité active, avec un lien vers `role` si fourni.
+
+        Seul l'email est requis : le téléphone est généré et le nom reprend
+        la partie locale de l'email.
+        """
+        identity = CoreIdentity(
+            email=email,
+            phone=phone or f"+237699{next(_phone_seq):06d}",
+            first_name=first_name,
+            last_name=last_name or email.split("@", 1)[0],
+            is_active=True,
+            metadata=metadata or {},
+        )
+        self._identities.append(identity)
+        if role is not None:
+            self._links.append(IdentityRoleLink(identity=identity, role=role, is_active=True))
+        return identity
+
+    def user(self, identity: CoreIdentity) -> User:
+        """
+        Prépare le User Django rattaché à `identity` par son email.
+
+        CoreIdentity n'a pas de clé étrangère vers User : le lien passe par
+        l'email (username), connu avant l'INSERT, sans UPDATE a posteriori.
+
+        Mot de passe inutilisable (aucun hachage) : les tests s'authentifient
+        via force_authenticate.
+        """
+        user = User(username=identity.email, email=identity.email)
+        user.set_unusable_password()
+        self._users.append(user)
+        return user
+
+    def student_profile(
+        self,
+        identity: CoreIdentity,
+        program: Program,
+        matricule: str,
+        date_entree: date,
+        **fields: Any,
+    ) -> StudentProfile:
+        """Prépare un profil étudiant ; `program` doit être sauvegardé avant `flush()`."""
+        profile = StudentProfile(
+            identity=identity,
+            matricule_permanent=matricule,
+            date_entree=date_entree,
+            current_program=program,
+            **fields,
+        )
+        self._profiles.append(profile)
+        return profile
+
+    def flush(self) -> None:
+        """
+        Insère les objets en attente (un INSERT par modèle) et vide les files.
+
+        Pas de transaction.atomic() ici : appelé depuis setUpTestData, tout est
+        déjà dans l'atomic de classe de TestCase, annulé en un seul rollback.
+        """
+        if self._identities:
+            CoreIdentity.objects.bulk_create(self._identities)
+        if self._users:
+            User.objects.bulk_create(self._users)
+        if self._links:
+            IdentityRoleLink.objects.bulk_create(self._links)
+        if self._profiles:
+            StudentProfile.objects.bulk_create(self._profiles)
+        self._identities, self._users, self._links, self._profiles = [], [], [], []
+
+
+def list_results(response) -> list:
+    """Éléments d'une réponse de liste, paginée (`results`) ou non."""
+    data = response.data
+    return data if isinstance(data, list) else data.get("results", [])
+
+
+def call_view(
+    view,
+    path: str,
+    user: Optional[User],
+    role_active: Optional[str],
+    data=None,
+    method: str = "get",
+):
+    """
+    Appelle directement `view` avec une requête authentifiée pour `user`.
+
+    ActiveRoleMiddleware n'est pas exécuté : request.role_active est posé
+    à la main, comme le ferait le header X-Role-Active. Les corps POST sont
+    encodés en JSON, sauf s'ils sont déjà sérialisés (str/bytes).
+
+    `role_active=None` simule l'absence de header ; `user=None` laisse la
+    requête anonyme (authentification DRF normale).
+    """
+    if method == "get":
+        kwargs = {}
+    elif isinstance(data, (str, bytes)):
+        kwargs = {"content_type": "application/json"}
+    else:
+        kwargs = {"format": "json"}
+    if role_active:
+        kwargs["HTTP_X_ROLE_ACTIVE"] = role_active
+    request = getattr(request_factory, method)(path, data, **kwargs)
+    request.role_active = role_active
+    if user is not None:
+        force_authenticate(request, user=user)
+    return view(request)
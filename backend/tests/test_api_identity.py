@@ -3,11 +3,12 @@ from __future__ import annotations
 import uuid
 
 import pytest
-from django.contrib.auth.models import User
 from rest_framework.test import APIClient
 
 from identity.models import CoreIdentity
 
+from .factories import make_user
+
 
 @pytest.mark.django_db
 def test_api_identity_list_authenticated() -> None:
@@ -18,7 +19,7 @@ def test_api_identity_list_authenticated() -> None:
         first_name="Api",
         last_name="User",
     )
-    user = User.objects.create_user(username="tester", password="secret")
+    user = make_user(username="tester")
     client = APIClient()
     client.force_authenticate(user=user)
 
@@ -9,7 +9,6 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
 
 from apps.academic.models import (
     AcademicYear,
@@ -23,14 +22,16 @@ from apps.finance.models import Invoice, Payment
 from django.db.models import Sum
 from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
 
+from .factories import list_results
+
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestBourseAttribution:
     """Tests d'attribution de bourses."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
         
         # Créer les rôles
         self.scolarite_role, _ = RbacRoleDef.objects.get_or_create(
@@ -395,7 +396,7 @@ class TestBourseAttribution:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        bourses = response.data if isinstance(response.data, list) else response.data.get("results", [])
+        bourses = list_results(response)
         
         # Vérifier qu'on a au moins 2 bourses actives
         assert len(bourses) >= 2
@@ -485,7 +486,7 @@ class TestBourseAttribution:
         )
 
         assert response_all.status_code == status.HTTP_200_OK
-        all_bourses = response_all.data if isinstance(response_all.data, list) else response_all.data.get("results", [])
+        all_bourses = list_results(response_all)
         
         # Vérifier qu'on voit uniquement ses propres bourses
         all_bourse_ids = [str(b.get("id", "")) for b in all_bourses]
@@ -3,7 +3,6 @@ from __future__ import annotations
 from decimal import Decimal
 
 import pytest
-from django.contrib.auth.models import User
 from django.utils import timezone
 from rest_framework.test import APIClient
 
@@ -11,6 +10,8 @@ from apps.academic.models import Faculty, Program, StudentProfile
 from apps.finance.models import Invoice, Payment
 from identity.models import CoreIdentity, SysAuditLog
 
+from .factories import make_user
+
 
 @pytest.mark.django_db
 def test_recteur_dashboard_kpis() -> None:
@@ -48,7 +49,7 @@ def test_recteur_dashboard_kpis() -> None:
         invoice=invoice, amount=Decimal("100000"), method=Payment.METHOD_CASH
     )
 
-    user = User.objects.create_user(username="recteur", password="secret")
+    user = make_user(username="recteur")
     client = APIClient()
     client.force_authenticate(user=user)
 
@@ -0,0 +1,30 @@
+"""Tests pour api/mixins.py"""
+import pytest
+from rest_framework.request import Request
+from rest_framework.test import force_authenticate
+
+from api.mixins import _get_identity_from_request
+from identity.models import CoreIdentity
+
+from .factories import make_user, request_factory
+
+
+@pytest.mark.django_db
+def test_identity_lookup_memoized_per_request(django_assert_num_queries):
+    """L'identité est résolue une seule fois par requête, Request DRF comprise."""
+    identity = CoreIdentity.objects.create(
+        email="memo@iuec.cm",
+        phone="690000013",
+        first_name="Memo",
+        last_name="Test",
+        is_active=True,
+    )
+    user = make_user("memo@iuec.cm")
+    http_request = request_factory.get("/api/faculties/")
+    http_request.user = user
+    force_authenticate(http_request, user=user)
+    drf_request = Request(http_request)
+
+    with django_assert_num_queries(1):
+        assert _get_identity_from_request(drf_request) == identity
+        assert _get_identity_from_request(http_request) == identity
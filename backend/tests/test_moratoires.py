@@ -9,7 +9,6 @@ from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
 
 from apps.academic.models import (
     AcademicYear,
@@ -22,14 +21,16 @@ from apps.academic.models import (
 from apps.finance.models import Invoice, Payment
 from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
 
+from .factories import list_results
+
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestMoratoireCreation:
     """Tests de création de moratoires."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
         
         # Créer les rôles
         self.finance_role, _ = RbacRoleDef.objects.get_or_create(
@@ -367,7 +368,7 @@ class TestMoratoireCreation:
         )
 
         assert response_all.status_code == status.HTTP_200_OK
-        all_moratoires = response_all.data if isinstance(response_all.data, list) else response_all.data.get("results", [])
+        all_moratoires = list_results(response_all)
         assert len(all_moratoires) >= 2
         
         # Filtrer manuellement par statut dans les résultats
@@ -8,7 +8,7 @@ from django.contrib.auth.models import User
 from django.db import IntegrityError
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient, APIRequestFactory
+from rest_framework.test import APIRequestFactory
 
 from apps.academic.models import (
     AcademicYear,
@@ -26,14 +26,16 @@ from apps.academic.services.note_calculator import NoteCalculatorService
 from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
 from rest_framework.test import APIRequestFactory
 
+from .factories import list_results
+
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestGradeBulkUpdateTeacherOnly:
     """Test que seul USER_TEACHER peut faire un bulk update de notes."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
         
         # Création des rôles
         self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
@@ -429,12 +431,12 @@ class TestGradeCalculationRulesJson:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestJuryCloseByValidator:
     """Test la clôture du PV jury par VALIDATOR_ACAD."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
         
         self.validator_role, _ = RbacRoleDef.objects.get_or_create(
             code="VALIDATOR_ACAD", defaults={"label": "Validateur", "is_active": True}
@@ -546,12 +548,12 @@ class TestJuryCloseByValidator:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestStudentNotesReadOnly:
     """Test que USER_STUDENT ne peut que lire ses notes."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
         
         self.student_role, _ = RbacRoleDef.objects.get_or_create(
             code="USER_STUDENT", defaults={"label": "Étudiant", "is_active": True}
@@ -628,7 +630,7 @@ class TestStudentNotesReadOnly:
         )
         
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", []) if isinstance(response.data, dict) else response.data
+        results = list_results(response)
         assert len(results) >= 1
         # Vérifier que la note appartient à l'étudiant (via matricule ou email)
         grade_data = results[0] if isinstance(results, list) else results
@@ -658,12 +660,12 @@ class TestStudentNotesReadOnly:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestSoDNoteModification:
     """Test la séparation des tâches (SoD) pour la modification de notes."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
         
         self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
             code="USER_TEACHER", defaults={"label": "Enseignant", "is_active": True}
@@ -4,12 +4,13 @@ import uuid
 
 import pytest
 from rest_framework.response import Response
-from django.contrib.auth.models import User
 from rest_framework.test import APIRequestFactory, force_authenticate
 from rest_framework.views import APIView
 
 from api.permissions import SoDPermission
 
+from .factories import make_user
+
 
 class DummySalaryView(APIView):
     permission_classes = (SoDPermission,)
@@ -28,7 +29,7 @@ def test_sod_violation_returns_403() -> None:
     payload["identity_uuid"] = payload["beneficiary_uuid"]
     request = factory.post("/api/salary/validate/", payload, format="json")
     request.role_active = "MANAGER_RH_PAY"
-    user = User.objects.create_user(username="sod-user", password="secret")
+    user = make_user(username="sod-user")
     force_authenticate(request, user=user)
 
     response = DummySalaryView.as_view()(request)
@@ -45,7 +46,7 @@ def test_sod_rh_pay_auto_salary_blocked() -> None:
     payload["identity_uuid"] = payload["beneficiary_uuid"]
     request = factory.post("/api/rh-pay/validate/", payload, format="json")
     request.role_active = "MANAGER_RH_PAY"
-    user = User.objects.create_user(username="sod-user-2", password="secret")
+    user = make_user(username="sod-user-2")
     force_authenticate(request, user=user)
 
     response = DummySalaryView.as_view()(request)
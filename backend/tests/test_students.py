@@ -5,12 +5,10 @@ from decimal import Decimal
 from uuid import uuid4
 
 import pytest
-from django.contrib.auth.models import User
 from django.core.exceptions import ValidationError
 from django.db import transaction
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient
 
 from apps.academic.models import (
     AcademicYear,
@@ -22,6 +20,8 @@ from apps.academic.models import (
 from apps.finance.models import Invoice, Payment
 from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
 
+from .factories import list_results, make_user
+
 
 @pytest.mark.django_db
 class TestStudentProfileCreationAndSync:
@@ -160,12 +160,12 @@ class TestRegistrationBlockedFinance:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestStudentSelfAccessOnly:
     """Tests d'accès restreint : étudiant ne voit que son propre profil."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
 
         # Création des rôles
         self.student_role = RbacRoleDef.objects.create(
@@ -205,16 +205,8 @@ class TestStudentSelfAccessOnly:
         )
 
         # Création des utilisateurs Django
-        self.student1_user = User.objects.create_user(
-            username="student1@iuec.cm",
-            email="student1@iuec.cm",
-            password="test123",
-        )
-        self.recteur_user = User.objects.create_user(
-            username="recteur@iuec.cm",
-            email="recteur@iuec.cm",
-            password="test123",
-        )
+        self.student1_user = make_user("student1@iuec.cm")
+        self.recteur_user = make_user("recteur@iuec.cm")
 
         # Liens identité-utilisateur
         self.student1_identity.user = self.student1_user
@@ -301,12 +293,12 @@ class TestStudentSelfAccessOnly:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestDoyenScopeFilter:
     """Tests de filtrage par scope pour DOYEN."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
 
         # Création des rôles
         self.doyen_role = RbacRoleDef.objects.create(
@@ -385,11 +377,7 @@ class TestDoyenScopeFilter:
             is_active=True,
             metadata={"scope_by_role": {"DOYEN": "FASE"}},
         )
-        self.doyen_user = User.objects.create_user(
-            username="doyen@iuec.cm",
-            email="doyen@iuec.cm",
-            password="test123",
-        )
+        self.doyen_user = make_user("doyen@iuec.cm")
         self.doyen_identity.user = self.doyen_user
         self.doyen_identity.save()
 
@@ -410,7 +398,7 @@ class TestDoyenScopeFilter:
         )
 
         assert response.status_code == status.HTTP_200_OK
-        results = response.data.get("results", []) if hasattr(response.data, "get") else response.data
+        results = list_results(response)
 
         # Le DOYEN de FASE ne devrait voir que l'étudiant de FASE
         # Note: Le filtrage par scope dépend de l'implémentation de ScopeFilterMixin
@@ -419,12 +407,12 @@ class TestDoyenScopeFilter:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestFinanceDeblock:
     """Tests de déblocage financier par OPERATOR_FINANCE."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
 
         # Création des rôles
         self.operator_finance_role = RbacRoleDef.objects.create(
@@ -457,11 +445,7 @@ class TestFinanceDeblock:
         )
 
         # Création des utilisateurs
-        self.operator_finance_user = User.objects.create_user(
-            username="finance@iuec.cm",
-            email="finance@iuec.cm",
-            password="test123",
-        )
+        self.operator_finance_user = make_user("finance@iuec.cm")
         self.operator_finance_identity.user = self.operator_finance_user
         self.operator_finance_identity.save()
 
@@ -521,12 +505,12 @@ class TestFinanceDeblock:
 
 
 @pytest.mark.django_db
+@pytest.mark.usefixtures("instance_api_client")
 class TestValidationRegistrationByValidator:
     """Tests de validation d'inscription par VALIDATOR_ACAD."""
 
     def setup_method(self):
         """Configuration initiale."""
-        self.client = APIClient()
 
         # Création des rôles
         self.validator_acad_role = RbacRoleDef.objects.create(
@@ -553,11 +537,7 @@ class TestValidationRegistrationByValidator:
         )
 
         # Création des utilisateurs
-        self.validator_user = User.objects.create_user(
-            username="validator@iuec.cm",
-            email="validator@iuec.cm",
-            password="test123",
-        )
+        self.validator_user = make_user("validator@iuec.cm")
         self.validator_identity.user = self.validator_user
         self.validator_identity.save()
 
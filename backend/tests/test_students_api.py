@@ -3,23 +3,23 @@ from __future__ import annotations
 from decimal import Decimal
 from uuid import uuid4
 
-from django.contrib.auth.models import User
 from django.db.models import Sum
 from django.utils import timezone
 from rest_framework import status
-from rest_framework.test import APIClient, APITestCase
+from rest_framework.test import APITestCase
 
-from apps.academic.models import AcademicYear, Program, RegistrationAdmin, StudentProfile
+from apps.academic.models import AcademicYear, Faculty, Program, RegistrationAdmin, StudentProfile
 from apps.finance.models import Invoice, Payment
 from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
 
+from .factories import make_user
+
 
 class TestStudentsAPI(APITestCase):
     """Tests pour l'API /api/students/ avec blocage intelligent."""
 
     def setUp(self):
         """Configuration initiale pour les tests."""
-        self.client = APIClient()
 
         # Création des rôles
         self.recteur_role = RbacRoleDef.objects.create(
@@ -91,21 +91,11 @@ class TestStudentsAPI(APITestCase):
         )
 
         # Création des utilisateurs Django
-        self.recteur_user = User.objects.create_user(
-            username="recteur@iuec.cm", email="recteur@iuec.cm", password="test123"
-        )
-        self.doyen_user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm", password="test123"
-        )
-        self.student_user = User.objects.create_user(
-            username="student@iuec.cm", email="student@iuec.cm", password="test123"
-        )
-        self.operator_finance_user = User.objects.create_user(
-            username="finance@iuec.cm", email="finance@iuec.cm", password="test123"
-        )
-        self.scolarite_user = User.objects.create_user(
-            username="scolarite@iuec.cm", email="scolarite@iuec.cm", password="test123"
-        )
+        self.recteur_user = make_user("recteur@iuec.cm")
+        self.doyen_user = make_user("doyen@iuec.cm")
+        self.student_user = make_user("student@iuec.cm")
+        self.operator_finance_user = make_user("finance@iuec.cm")
+        self.scolarite_user = make_user("scolarite@iuec.cm")
 
         # Lien des rôles (créés dans setUp, mais on peut les recréer si nécessaire)
         IdentityRoleLink.objects.get_or_create(
@@ -135,8 +125,6 @@ class TestStudentsAPI(APITestCase):
         )
 
         # Création d'une faculté et d'un programme
-        from apps.academic.models import Faculty
-
         self.faculty = Faculty.objects.create(
             code="FASE",
             name="Faculté des Sciences Économiques",
@@ -208,8 +196,6 @@ class TestStudentsAPI(APITestCase):
     def test_student_inscription_blocked(self):
         """Test POST /api/students/ avec solde négatif → 400."""
         # Créer une facture non payée pour bloquer l'inscription
-        from apps.finance.models import Invoice
-
         blocked_identity = CoreIdentity.objects.create(
             email="blocked@iuec.cm",
             phone="+237600000006",
@@ -319,11 +305,7 @@ class TestStudentsAPI(APITestCase):
 
     def test_student_list_unauthorized_role(self):
         """Test GET /api/students/ avec rôle non autorisé → 403."""
-        unauthorized_user = User.objects.create_user(
-            username="unauthorized@iuec.cm",
-            email="unauthorized@iuec.cm",
-            password="test123",
-        )
+        unauthorized_user = make_user("unauthorized@iuec.cm")
         self.client.force_authenticate(user=unauthorized_user)
         response = self.client.get("/api/students/", HTTP_X_ROLE_ACTIVE="UNKNOWN_ROLE")
         self.assertEqual(response.status_code, status.HTTP_403_FORBIDDEN)
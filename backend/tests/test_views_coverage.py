@@ -1,11 +1,11 @@
 """Tests supplémentaires pour améliorer la couverture de api/views.py."""
 from __future__ import annotations
 
+import json
 from decimal import Decimal
-from uuid import uuid4
 
 import pytest
-from django.contrib.auth.models import User
+from django.urls import resolve
 from django.utils import timezone
 from rest_framework import status
 from rest_framework.test import APITestCase
@@ -17,283 +17,175 @@ from apps.academic.models import (
     Grade,
     Program,
     RegistrationAdmin,
-    StudentProfile,
-    TeachingUnit,
 )
-from apps.finance.models import Invoice, Payment
-from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
+from apps.finance.models import Invoice
 
+from .factories import IdentityFactory, call_view, seed_roles
 
-@pytest.mark.django_db
-class TestDashboardDataCoverage(APITestCase):
-    """Tests pour améliorer la couverture de dashboard_data."""
+# course_id fixes (Evaluation.course_id est un UUIDField), un par classe
+COURSES_COURSE_ID = "00000000-0000-0000-0000-000000000001"
+GRADES_COURSE_ID = "00000000-0000-0000-0000-000000000002"
 
-    def setUp(self):
-        """Configuration initiale."""
-        # Création des rôles
-        self.recteur_role, _ = RbacRoleDef.objects.get_or_create(
-            code="RECTEUR", defaults={"label": "Recteur", "is_active": True}
-        )
-        self.operator_finance_role, _ = RbacRoleDef.objects.get_or_create(
-            code="OPERATOR_FINANCE", defaults={"label": "Opérateur Finance", "is_active": True}
-        )
-        self.scolarite_role, _ = RbacRoleDef.objects.get_or_create(
-            code="SCOLARITE", defaults={"label": "Scolarité", "is_active": True}
-        )
-        self.student_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_STUDENT", defaults={"label": "Étudiant", "is_active": True}
-        )
 
-        # Création des identités
-        self.recteur_identity = CoreIdentity.objects.create(
-            email="recteur.coverage@iuec.cm",
-            phone="+237600000200",
-            first_name="Recteur",
-            last_name="Coverage",
-            is_active=True,
-        )
-        self.recteur_user = User.objects.create_user(
-            username="recteur.coverage@iuec.cm",
-            email="recteur.coverage@iuec.cm",
-            password="test123",
-        )
-        self.recteur_identity.user = self.recteur_user
-        self.recteur_identity.save()
-
-        self.finance_identity = CoreIdentity.objects.create(
-            email="finance.coverage@iuec.cm",
-            phone="+237600000201",
-            first_name="Finance",
-            last_name="Coverage",
-            is_active=True,
-        )
-        self.finance_user = User.objects.create_user(
-            username="finance.coverage@iuec.cm",
-            email="finance.coverage@iuec.cm",
-            password="test123",
-        )
-        self.finance_identity.user = self.finance_user
-        self.finance_identity.save()
-
-        self.scolarite_identity = CoreIdentity.objects.create(
-            email="scolarite.coverage@iuec.cm",
-            phone="+237600000202",
-            first_name="Scolarité",
-            last_name="Coverage",
-            is_active=True,
-        )
-        self.scolarite_user = User.objects.create_user(
-            username="scolarite.coverage@iuec.cm",
-            email="scolarite.coverage@iuec.cm",
-            password="test123",
-        )
-        self.scolarite_identity.user = self.scolarite_user
-        self.scolarite_identity.save()
-
-        self.student_identity = CoreIdentity.objects.create(
-            email="student.coverage@iuec.cm",
-            phone="+237600000203",
-            first_name="Étudiant",
-            last_name="Coverage",
-            is_active=True,
-        )
-        self.student_user = User.objects.create_user(
-            username="student.coverage@iuec.cm",
-            email="student.coverage@iuec.cm",
-            password="test123",
-        )
-        self.student_identity.user = self.student_user
-        self.student_identity.save()
+class _BaseRbacFixture(APITestCase):
+    """
+    Données communes aux classes de ce module, créées une fois par classe :
+    rôles, faculté FASE et programme ECO.
+    """
 
-        IdentityRoleLink.objects.create(
-            identity=self.recteur_identity,
-            role=self.recteur_role,
-            is_active=True,
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.finance_identity,
-            role=self.operator_finance_role,
-            is_active=True,
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.scolarite_identity,
-            role=self.scolarite_role,
-            is_active=True,
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.student_identity,
-            role=self.student_role,
-            is_active=True,
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Référentiel partagé ; les sous-classes appellent super() en premier."""
+        # Rôles de référence : un INSERT groupé + un SELECT pour toute la classe.
+        # Propres à la classe : ils sont annulés avec sa transaction.
+        cls.roles = seed_roles()
 
-        # Création faculté et programme
-        self.faculty = Faculty.objects.create(
+        cls.faculty = Faculty.objects.create(
             code="FASE",
             name="Faculté des Sciences Économiques",
             is_active=True,
         )
-        self.program = Program.objects.create(
+        cls.program = Program.objects.create(
             code="ECO",
             name="Économie",
-            faculty=self.faculty,
+            faculty=cls.faculty,
             is_active=True,
         )
 
-        # Création année académique
-        self.academic_year = AcademicYear.objects.create(
-            code="2024-2025",
-            label="Année académique 2024-2025",
-            is_active=True,
-        )
 
-        # Création d'un étudiant
-        self.student_profile = StudentProfile.objects.create(
-            identity=self.student_identity,
-            matricule_permanent="ST500",
-            date_entree=timezone.now().date(),
-            current_program=self.program,
-            finance_status="OK",
-        )
+@pytest.mark.django_db
+class TestDashboardDataCoverage(_BaseRbacFixture):
+    """Tests pour améliorer la couverture de dashboard_data."""
 
-        # Création d'une facture
-        self.invoice = Invoice.objects.create(
-            identity_uuid=self.student_identity.id,
-            number="INV500",
-            program_code="ECO",
-            total_amount=Decimal("100000.00"),
-            due_date=timezone.now().date(),
-            status=Invoice.STATUS_ISSUED,
-        )
+    @classmethod
+    def setUpTestData(cls):
+        """Configuration initiale."""
+        super().setUpTestData()
+        # Vue résolue une fois par classe, via l'URLconf réelle
+        cls.dashboard_view = resolve("/api/dashboard/").func
 
-    def test_dashboard_operator_finance(self):
-        """Test dashboard OPERATOR_FINANCE avec factures impayées."""
-        self.client.force_authenticate(user=self.finance_user)
+        # Création des rôles
+        cls.operator_finance_role = cls.roles["OPERATOR_FINANCE"]
+        cls.scolarite_role = cls.roles["SCOLARITE"]
+        cls.student_role = cls.roles["USER_STUDENT"]
 
-        response = self.client.get(
-            "/api/dashboard/",
-            {"role": "OPERATOR_FINANCE"},
-            HTTP_X_ROLE_ACTIVE="OPERATOR_FINANCE",
+        # Création des identités, utilisateurs et liens de rôle (un INSERT par table)
+        factory = IdentityFactory()
+        cls.finance_identity = factory.identity(
+            "finance.coverage@iuec.cm", "+237600000201", "Finance", "Coverage", role=cls.operator_finance_role
         )
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.data
-        # Le endpoint retourne "unpaidInvoices" (camelCase) ou "unpaid_invoices"
-        assert "unpaidInvoices" in data or "unpaid_invoices" in data
-        assert "totalPending" in data or "total_pending" in data or "totalPending" in data
-
-    def test_dashboard_scolarite(self):
-        """Test dashboard SCOLARITE."""
-        self.client.force_authenticate(user=self.scolarite_user)
-
-        response = self.client.get(
-            "/api/dashboard/",
-            {"role": "SCOLARITE"},
-            HTTP_X_ROLE_ACTIVE="SCOLARITE",
+        cls.finance_user = factory.user(cls.finance_identity)
+        cls.scolarite_identity = factory.identity(
+            "scolarite.coverage@iuec.cm", "+237600000202", "Scolarité", "Coverage", role=cls.scolarite_role
         )
-
-        assert response.status_code == status.HTTP_200_OK
-        data = response.data
-        assert "kpis" in data
-
-    def test_dashboard_student(self):
-        """Test dashboard USER_STUDENT."""
-        self.client.force_authenticate(user=self.student_user)
-
-        response = self.client.get(
-            "/api/dashboard/",
-            {"role": "USER_STUDENT"},
-            HTTP_X_ROLE_ACTIVE="USER_STUDENT",
+        cls.scolarite_user = factory.user(cls.scolarite_identity)
+        cls.student_identity = factory.identity(
+            "student.coverage@iuec.cm", "+237600000203", "Étudiant", "Coverage", role=cls.student_role
         )
+        cls.student_user = factory.user(cls.student_identity)
 
-        assert response.status_code == status.HTTP_200_OK
-        data = response.data
-        assert "balance" in data or "kpis" in data
+        # Création d'un étudiant
+        cls.student_profile = factory.student_profile(
+            cls.student_identity, cls.program, "ST500", timezone.now().date(), finance_status="OK"
+        )
+        factory.flush()
+
+        # Création d'une facture impayée de 100000. bulk_create contourne
+        # Invoice.save() (qui recalculerait total_amount depuis les lignes)
+        # et le post_save de recalcul du solde, inutiles ici
+        (cls.invoice,) = Invoice.objects.bulk_create(
+            [
+                Invoice(
+                    identity_uuid=cls.student_identity.id,
+                    number="INV500",
+                    program_code="ECO",
+                    total_amount=Decimal("100000.00"),
+                    due_date=timezone.now().date(),
+                    status=Invoice.STATUS_ISSUED,
+                )
+            ]
+        )
+
+    # (rôle actif, utilisateur, groupes de clés : au moins une clé par groupe)
+    # Le endpoint retourne "unpaidInvoices" (camelCase) ou "unpaid_invoices"
+    DASHBOARD_CASES = [
+        (
+            "OPERATOR_FINANCE",
+            "finance_user",
+            [{"unpaidInvoices", "unpaid_invoices"}, {"totalPending", "total_pending"}],
+        ),
+        ("SCOLARITE", "scolarite_user", [{"kpis"}]),
+        ("USER_STUDENT", "student_user", [{"balance", "kpis"}]),
+    ]
+
+    def test_dashboard_by_role(self):
+        """Test dashboard OPERATOR_FINANCE (factures impayées), SCOLARITE et USER_STUDENT."""
+        # Un seul test (une transaction) pour les trois rôles, un subTest par rôle
+        for role_code, user_attr, expected_key_groups in self.DASHBOARD_CASES:
+            with self.subTest(role=role_code):
+                response = call_view(
+                    self.dashboard_view,
+                    "/api/dashboard/",
+                    getattr(self, user_attr),
+                    role_code,
+                    {"role": role_code},
+                )
+
+                assert response.status_code == status.HTTP_200_OK
+                data = response.data
+                for keys in expected_key_groups:
+                    assert any(key in data for key in keys), f"{role_code}: une clé parmi {sorted(keys)} attendue"
 
 
 @pytest.mark.django_db
-class TestCoursesEndpointCoverage(APITestCase):
+class TestCoursesEndpointCoverage(_BaseRbacFixture):
     """Tests pour améliorer la couverture de courses_endpoint."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Configuration initiale."""
-        self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_TEACHER", defaults={"label": "Enseignant", "is_active": True}
-        )
-
-        self.teacher_identity = CoreIdentity.objects.create(
-            email="teacher.coverage@iuec.cm",
-            phone="+237600000204",
-            first_name="Enseignant",
-            last_name="Coverage",
-            is_active=True,
-        )
-        self.teacher_user = User.objects.create_user(
-            username="teacher.coverage@iuec.cm",
-            email="teacher.coverage@iuec.cm",
-            password="test123",
-        )
-        self.teacher_identity.user = self.teacher_user
-        self.teacher_identity.save()
+        super().setUpTestData()
+        cls.courses_view = resolve("/api/courses/").func
 
-        IdentityRoleLink.objects.create(
-            identity=self.teacher_identity,
-            role=self.teacher_role,
-            is_active=True,
-        )
+        cls.teacher_role = cls.roles["USER_TEACHER"]
 
-        self.faculty = Faculty.objects.create(
-            code="FASE",
-            name="Faculté des Sciences Économiques",
-            is_active=True,
-        )
-        self.program = Program.objects.create(
-            code="ECO",
-            name="Économie",
-            faculty=self.faculty,
-            is_active=True,
+        factory = IdentityFactory()
+        cls.teacher_identity = factory.identity(
+            "teacher.coverage@iuec.cm", "+237600000204", "Enseignant", "Coverage", role=cls.teacher_role
         )
+        cls.teacher_user = factory.user(cls.teacher_identity)
 
-        self.student_identity = CoreIdentity.objects.create(
-            email="student.courses@iuec.cm",
-            phone="+237600000205",
-            first_name="Étudiant",
-            last_name="Courses",
-            is_active=True,
-        )
-        self.student_profile = StudentProfile.objects.create(
-            identity=self.student_identity,
-            matricule_permanent="ST501",
-            date_entree=timezone.now().date(),
-            current_program=self.program,
-            finance_status="OK",
+        cls.student_identity = factory.identity("student.courses@iuec.cm")
+        cls.student_profile = factory.student_profile(
+            cls.student_identity, cls.program, "ST501", timezone.now().date(), finance_status="OK"
         )
+        factory.flush()
 
         # Création d'un cours et d'évaluations
-        self.course_id = str(uuid4())
-        self.evaluation = Evaluation.objects.create(
-            course_id=self.course_id,
+        cls.course_id = COURSES_COURSE_ID
+        cls.evaluation = Evaluation.objects.create(
+            course_id=cls.course_id,
             type=Evaluation.EvaluationType.CC,
             weight=Decimal("0.3"),
             max_score=Decimal("20"),
         )
 
         # Création d'une note pour que le cours apparaisse dans la liste
-        Grade.objects.create(
-            evaluation=self.evaluation,
-            student=self.student_profile,
-            value=Decimal("15.0"),
-            teacher=self.teacher_identity,
+        # (bulk_create : pas de post_save audit + recalcul UE)
+        Grade.objects.bulk_create(
+            [
+                Grade(
+                    evaluation=cls.evaluation,
+                    student=cls.student_profile,
+                    value=Decimal("15.0"),
+                    teacher=cls.teacher_identity,
+                )
+            ]
         )
 
     def test_courses_endpoint_teacher(self):
         """Test GET /api/courses/ pour USER_TEACHER."""
-        self.client.force_authenticate(user=self.teacher_user)
-
-        response = self.client.get(
-            "/api/courses/",
-            {"teacher": "me"},
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-        )
+        response = call_view(self.courses_view, "/api/courses/", self.teacher_user, "USER_TEACHER", {"teacher": "me"})
 
         assert response.status_code == status.HTTP_200_OK
         data = response.data
@@ -301,156 +193,100 @@ class TestCoursesEndpointCoverage(APITestCase):
         assert len(data["results"]) >= 0  # Peut être vide si pas de TeachingUnit correspondant
 
 
-@pytest.mark.django_db
-class TestWorkflowsValidateCoverage(APITestCase):
-    """Tests pour améliorer la couverture de workflows_validate."""
-
-    def setUp(self):
-        """Configuration initiale."""
-        self.scolarite_role, _ = RbacRoleDef.objects.get_or_create(
-            code="SCOLARITE", defaults={"label": "Scolarité", "is_active": True}
-        )
-
-        self.scolarite_identity = CoreIdentity.objects.create(
-            email="scolarite.workflow@iuec.cm",
-            phone="+237600000206",
-            first_name="Scolarité",
-            last_name="Workflow",
-            is_active=True,
-        )
-        self.scolarite_user = User.objects.create_user(
-            username="scolarite.workflow@iuec.cm",
-            email="scolarite.workflow@iuec.cm",
-            password="test123",
-        )
-        self.scolarite_identity.user = self.scolarite_user
-        self.scolarite_identity.save()
-
-        IdentityRoleLink.objects.create(
-            identity=self.scolarite_identity,
-            role=self.scolarite_role,
-            is_active=True,
-        )
-
-        self.faculty = Faculty.objects.create(
-            code="FASE",
-            name="Faculté des Sciences Économiques",
-            is_active=True,
-        )
-        self.program = Program.objects.create(
-            code="ECO",
-            name="Économie",
-            faculty=self.faculty,
-            is_active=True,
-        )
-
-        self.student_identity = CoreIdentity.objects.create(
-            email="student.workflow@iuec.cm",
-            phone="+237600000207",
-            first_name="Étudiant",
-            last_name="Workflow",
-            is_active=True,
-        )
-        self.student_profile = StudentProfile.objects.create(
-            identity=self.student_identity,
-            matricule_permanent="ST502",
-            date_entree=timezone.now().date(),
-            current_program=self.program,
-            finance_status="OK",
-        )
-
-        self.academic_year = AcademicYear.objects.create(
-            code="2024-2025",
-            label="Année académique 2024-2025",
-            is_active=True,
-        )
-
-        self.registration = RegistrationAdmin.objects.create(
-            student=self.student_profile,
-            academic_year=self.academic_year,
-            level="L1",
-            finance_status="OK",
-        )
-
-    def test_workflows_validate_certificate_issue(self):
-        """Test POST /api/workflows/ avec workflow CERTIFICATE_ISSUE."""
-        self.client.force_authenticate(user=self.scolarite_user)
-
-        response = self.client.post(
-            "/api/workflows/",
-            {
-                "workflow": "CERTIFICATE_ISSUE",
-                "registration_id": self.registration.id,
-            },
-            HTTP_X_ROLE_ACTIVE="SCOLARITE",
-            format="json",
-        )
-
-        # Le endpoint devrait accepter la requête (même si la logique complète n'est pas implémentée)
-        assert response.status_code in [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN]
+@pytest.fixture
+def workflow_registration(db):
+    """
+    Utilisateur SCOLARITE et inscription L1 d'un étudiant FASE/ECO.
+
+    Fixture de fonction : le test unique de workflows_validate n'a pas besoin
+    de la transaction de classe d'APITestCase.
+    """
+    role = seed_roles()["SCOLARITE"]
+    faculty = Faculty.objects.create(
+        code="FASE",
+        name="Faculté des Sciences Économiques",
+        is_active=True,
+    )
+    program = Program.objects.create(
+        code="ECO",
+        name="Économie",
+        faculty=faculty,
+        is_active=True,
+    )
+
+    factory = IdentityFactory()
+    scolarite_identity = factory.identity(
+        "scolarite.workflow@iuec.cm", "+237600000206", "Scolarité", "Workflow", role=role
+    )
+    scolarite_user = factory.user(scolarite_identity)
+    student_identity = factory.identity("student.workflow@iuec.cm")
+    student_profile = factory.student_profile(
+        student_identity, program, "ST502", timezone.now().date(), finance_status="OK"
+    )
+    factory.flush()
+
+    academic_year = AcademicYear.objects.create(
+        code="2024-2025",
+        label="Année académique 2024-2025",
+        is_active=True,
+    )
+    registration = RegistrationAdmin.objects.create(
+        student=student_profile,
+        academic_year=academic_year,
+        level="L1",
+        finance_status="OK",
+    )
+    return scolarite_user, registration
+
+
+def test_workflows_validate_certificate_issue(workflow_registration, api_client):
+    """Test POST /api/workflows/ avec workflow CERTIFICATE_ISSUE (couverture de workflows_validate)."""
+    scolarite_user, registration = workflow_registration
+
+    # Seul test passant par le client HTTP : vérifie aussi routage et middlewares
+    api_client.force_authenticate(user=scolarite_user)
+
+    response = api_client.post(
+        "/api/workflows/",
+        {
+            "workflow": "CERTIFICATE_ISSUE",
+            "registration_id": registration.id,
+        },
+        HTTP_X_ROLE_ACTIVE="SCOLARITE",
+        format="json",
+    )
+
+    # Le endpoint devrait accepter la requête (même si la logique complète n'est pas implémentée)
+    assert response.status_code in [status.HTTP_200_OK, status.HTTP_400_BAD_REQUEST, status.HTTP_403_FORBIDDEN]
 
 
 @pytest.mark.django_db
-class TestGradesEndpointCoverage(APITestCase):
+class TestGradesEndpointCoverage(_BaseRbacFixture):
     """Tests pour améliorer la couverture de grades_endpoint."""
 
-    def setUp(self):
+    @classmethod
+    def setUpTestData(cls):
         """Configuration initiale."""
-        self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_TEACHER", defaults={"label": "Enseignant", "is_active": True}
-        )
+        super().setUpTestData()
+        cls.grades_view = resolve("/api/grades/").func
 
-        self.teacher_identity = CoreIdentity.objects.create(
-            email="teacher.grades@iuec.cm",
-            phone="+237600000208",
-            first_name="Enseignant",
-            last_name="Grades",
-            is_active=True,
-        )
-        self.teacher_user = User.objects.create_user(
-            username="teacher.grades@iuec.cm",
-            email="teacher.grades@iuec.cm",
-            password="test123",
-        )
-        self.teacher_identity.user = self.teacher_user
-        self.teacher_identity.save()
+        cls.teacher_role = cls.roles["USER_TEACHER"]
 
-        IdentityRoleLink.objects.create(
-            identity=self.teacher_identity,
-            role=self.teacher_role,
-            is_active=True,
-        )
-
-        self.faculty = Faculty.objects.create(
-            code="FASE",
-            name="Faculté des Sciences Économiques",
-            is_active=True,
-        )
-        self.program = Program.objects.create(
-            code="ECO",
-            name="Économie",
-            faculty=self.faculty,
-            is_active=True,
+        factory = IdentityFactory()
+        cls.teacher_identity = factory.identity(
+            "teacher.grades@iuec.cm", "+237600000208", "Enseignant", "Grades", role=cls.teacher_role
         )
+        cls.teacher_user = factory.user(cls.teacher_identity)
 
-        self.student_identity = CoreIdentity.objects.create(
-            email="student.grades@iuec.cm",
-            phone="+237600000209",
-            first_name="Étudiant",
-            last_name="Grades",
-            is_active=True,
-        )
-        self.student_profile = StudentProfile.objects.create(
-            identity=self.student_identity,
-            matricule_permanent="ST503",
-            date_entree=timezone.now().date(),
-            current_program=self.program,
-            finance_status="OK",
+        cls.student_identity = factory.identity("student.grades@iuec.cm")
+        cls.student_profile = factory.student_profile(
+            cls.student_identity, cls.program, "ST503", timezone.now().date(), finance_status="OK"
         )
+        factory.flush()
 
-        self.course_id = str(uuid4())
-        self.evaluation = Evaluation.objects.create(
-            course_id=self.course_id,
+        cls.course_id = GRADES_COURSE_ID
+        cls.evaluation = Evaluation.objects.create(
+            course_id=cls.course_id,
             type=Evaluation.EvaluationType.CC,
             weight=Decimal("0.3"),
             max_score=Decimal("20"),
@@ -458,12 +294,8 @@ class TestGradesEndpointCoverage(APITestCase):
 
     def test_grades_endpoint_get_teacher(self):
         """Test GET /api/grades/ pour USER_TEACHER."""
-        self.client.force_authenticate(user=self.teacher_user)
-
-        response = self.client.get(
-            "/api/grades/",
-            {"course_id": self.course_id},
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
+        response = call_view(
+            self.grades_view, "/api/grades/", self.teacher_user, "USER_TEACHER", {"course_id": self.course_id}
         )
 
         assert response.status_code == status.HTTP_200_OK
@@ -472,22 +304,15 @@ class TestGradesEndpointCoverage(APITestCase):
 
     def test_grades_endpoint_post_teacher(self):
         """Test POST /api/grades/ pour USER_TEACHER."""
-        self.client.force_authenticate(user=self.teacher_user)
-
-        response = self.client.post(
-            "/api/grades/",
+        grade_pairs = [(self.student_profile, 15.5)]
+        # Corps pré-sérialisé : pas d'aller-retour par le renderer JSON de DRF
+        payload = json.dumps(
             {
                 "evaluation_id": str(self.evaluation.id),
-                "grades": [
-                    {
-                        "student_uuid": str(self.student_profile.id),
-                        "value": 15.5,
-                    }
-                ],
-            },
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-            format="json",
+                "grades": [{"student_uuid": str(profile.id), "value": value} for profile, value in grade_pairs],
+            }
         )
+        response = call_view(self.grades_view, "/api/grades/", self.teacher_user, "USER_TEACHER", payload, method="post")
 
         assert response.status_code == status.HTTP_200_OK
         assert "count" in response.data
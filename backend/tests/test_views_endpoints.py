@@ -1,13 +1,16 @@
 """Tests supplémentaires pour api/views.py"""
+import logging
 import uuid
+from datetime import date
+from unittest.mock import patch
 from uuid import uuid4
 
 import pytest
 from decimal import Decimal
-from django.contrib.auth.models import User
-from django.utils import timezone
-from rest_framework.test import APIClient
+from django.urls import resolve
+from rest_framework.test import APITestCase
 
+from api.students_views import StudentsViewSet
 from apps.academic.models import (
     AcademicYear,
     Evaluation,
@@ -17,320 +20,243 @@ from apps.academic.models import (
     RegistrationAdmin,
     StudentProfile,
 )
-from apps.finance.models import Invoice, Payment
-from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef, SysAuditLog
+from apps.finance.models import Invoice
+from identity.models import CoreIdentity, IdentityRoleLink, SysAuditLog
+
+from .factories import IdentityFactory, JSONClient, call_view, make_user, seed_roles
+
+# Date d'entrée fixe des profils étudiants (tests déterministes)
+DATE_ENTREE = date(2024, 9, 1)
+
+
+@pytest.fixture(autouse=True)
+def _mute_audit(monkeypatch):
+    """
+    Coupe les écritures SysAuditLog et les logs pendant chaque test du module.
+
+    Aucun test ici ne vérifie la piste d'audit (voir test_audit_trail.py) :
+    on économise un INSERT par appel de vue mutant et le formatage des logs.
+    """
+    monkeypatch.setattr(SysAuditLog.objects, "create", lambda **kwargs: None)
+    logging.disable(logging.CRITICAL)
+    yield
+    logging.disable(logging.NOTSET)
 
 
 @pytest.mark.django_db
-class TestStudentsEndpoint:
+class TestStudentsEndpoint(APITestCase):
     """Tests pour students_endpoint"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.identity = CoreIdentity.objects.create(
-            email="student@iuec.cm",
-            phone="690000020",
-            first_name="Student",
-            last_name="Test",
-            is_active=True,
-        )
-        self.faculty = Faculty.objects.create(
+    client_class = JSONClient
+
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.student_role = cls.roles["USER_STUDENT"]
+        cls.recteur_role = cls.roles["RECTEUR"]
+        # Identités, lien de rôle et utilisateurs : un INSERT groupé par modèle
+        factory = IdentityFactory()
+        # L'étudiant porte aussi RECTEUR : test_students_post_missing_fields poste en son nom
+        cls.identity = factory.identity(
+            "student@iuec.cm", "690000020", "Student", "Test", role=cls.recteur_role
+        )
+        # Identité RECTEUR distincte de l'étudiant à inscrire (pour éviter le conflit SoD)
+        cls.recteur_identity = factory.identity(
+            "recteur@iuec.cm", "690000030", "Recteur", "Test", role=cls.recteur_role
+        )
+        cls.student_user = factory.user(cls.identity)
+        cls.recteur_user = factory.user(cls.recteur_identity)
+        factory.flush()
+        cls.faculty = Faculty.objects.create(
             code="FASE", name="Faculté des Sciences", is_active=True
         )
-        self.program = Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
+        cls.program = Program.objects.create(
+            code="INFO", name="Informatique", faculty=cls.faculty, is_active=True
         )
-        self.year = AcademicYear.objects.create(
+        cls.year = AcademicYear.objects.create(
             code="2024-2025", label="Année 2024-2025", is_active=True
         )
-        self.student_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_STUDENT", defaults={"label": "Étudiant", "is_active": True}
-        )
-        self.recteur_role, _ = RbacRoleDef.objects.get_or_create(
-            code="RECTEUR", defaults={"label": "Recteur", "is_active": True}
-        )
+        # Identifiants sérialisés une fois pour les payloads POST
+        cls.identity_id_str = str(cls.identity.id)
+        cls.program_id_str = str(cls.program.id)
+        cls.year_id_str = str(cls.year.id)
+        cls.students_view = resolve("/api/students/").func
+        # Inscription de l'identité étudiante existante (sans profil) par StudentsViewSet.create
+        cls.enrollment_payload = {
+            "first_name": "Student",
+            "last_name": "Test",
+            "email": "student@iuec.cm",
+            "phone": "690000020",
+            "program_id": cls.program_id_str,
+            "academic_year_id": cls.year_id_str,
+            "level": "L1",
+        }
 
     def test_students_get_no_role(self):
         """Test GET students sans rôle actif"""
-        user = User.objects.create_user(
-            username="student@iuec.cm", email="student@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        response = self.client.get("/api/students/")
+        response = call_view(self.students_view, "/api/students/", self.student_user, None)
 
         assert response.status_code == 403
 
     def test_students_post_success(self):
-        """Test POST students (création d'inscription)"""
-        # Créer une identité différente pour l'utilisateur qui fait la requête (RECTEUR)
-        # et une autre pour l'étudiant à inscrire (pour éviter le conflit SoD)
-        recteur_identity = CoreIdentity.objects.create(
-            email="recteur@iuec.cm",
-            phone="690000030",
-            first_name="Recteur",
-            last_name="Test",
-            is_active=True,
-        )
-        IdentityRoleLink.objects.create(
-            identity=recteur_identity, role=self.recteur_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="recteur@iuec.cm", email="recteur@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        # Créer une facture avec solde zéro (non bloquant)
-        # Le solde = invoices_total - paid_total
-        # Pour avoir un solde <= 0, on doit payer au moins autant que la facture
-        invoice = Invoice.objects.create(
-            identity_uuid=self.identity.id,
-            total_amount=Decimal("100000"),
-            status=Invoice.STATUS_PAID,
-        )
-        Payment.objects.create(invoice=invoice, amount=Decimal("100000"))
-
-        data = {
-            "identity_uuid": str(self.identity.id),
-            "matricule": "ST002",
-            "date_entree": "2024-09-01",
-            "program_id": str(self.program.id),
-            "year_id": str(self.year.id),
-            "level": "L1",
-            "finance_status": StudentProfile.FinanceStatus.OK,
-        }
-
-        response = self.client.post(
-            "/api/students/", data, HTTP_X_ROLE_ACTIVE="RECTEUR", format="json"
-        )
+        """Test POST students (création d'inscription) : identité existante, solde nul"""
+        self.client.force_authenticate(user=self.recteur_user)
+
+        with patch.object(
+            StudentsViewSet, "_calculate_balance_for_identity", return_value=Decimal("0")
+        ):
+            response = self.client.post(
+                "/api/students/", self.enrollment_payload, HTTP_X_ROLE_ACTIVE="RECTEUR"
+            )
 
         assert response.status_code == 201
         assert "student_id" in response.data
 
     def test_students_post_missing_fields(self):
         """Test POST students avec champs manquants"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.recteur_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="student@iuec.cm", email="student@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.student_user)
 
         data = {
-            "identity_uuid": str(self.identity.id),
+            "identity_uuid": self.identity_id_str,
             # Manque matricule, date_entree, etc.
         }
 
-        response = self.client.post(
-            "/api/students/", data, HTTP_X_ROLE_ACTIVE="RECTEUR", format="json"
-        )
+        response = self.client.post("/api/students/", data, HTTP_X_ROLE_ACTIVE="RECTEUR")
 
         assert response.status_code == 400
         assert "Champs requis manquants" in response.data["detail"]
 
     def test_students_post_blocked_negative_balance(self):
-        """Test POST students avec solde négatif (bloqué)"""
-        # Créer une identité différente pour l'utilisateur qui fait la requête (RECTEUR)
-        # et une autre pour l'étudiant à inscrire (pour éviter le conflit SoD)
-        recteur_identity = CoreIdentity.objects.create(
-            email="recteur2@iuec.cm",
-            phone="690000031",
-            first_name="Recteur",
-            last_name="Test2",
-            is_active=True,
-        )
-        IdentityRoleLink.objects.create(
-            identity=recteur_identity, role=self.recteur_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="recteur2@iuec.cm", email="recteur2@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        # Créer une facture avec solde positif (bloquant)
-        # Le solde = invoices_total - paid_total
-        # Pour avoir un solde > 0 (bloquant), on doit avoir invoices_total > paid_total
-        # Le code vérifie: if balance > 0: return Response({"detail": "Inscription bloquée: solde négatif."}, ...)
-        # Note: Le message dit "solde négatif" mais la condition est balance > 0 (solde positif = dette)
-        # Créer une facture avec un montant mais sans paiement
-        # Le solde = invoices_total - paid_total
-        # Pour avoir un solde > 0 (bloquant), on doit avoir invoices_total > paid_total
-        # Note: Invoice.save() recalcule total_amount depuis line_items (ligne 79)
-        # Il faut donc créer des line_items ou forcer total_amount après save
-        invoice = Invoice.objects.create(
-            identity_uuid=self.identity.id,
-            program_code=self.program.code,
-            line_items=[{"label": "Frais de scolarité", "amount": 100000}],
-            status=Invoice.STATUS_PAID,
-        )
-        # Le save() recalcule total_amount, mais on peut le forcer
-        invoice.total_amount = Decimal("100000")
-        invoice.save()
-        # Pas de paiement, donc solde = 100000 - 0 = 100000 > 0 (bloquant)
-        # Vérifier que le solde est bien > 0 avant de tester
-        from api.views import _get_balance_for_identity
-        balance = _get_balance_for_identity(self.identity.id)
-        # Le solde devrait être > 0 (100000 - 0 = 100000)
-        assert balance > 0, f"Le solde devrait être > 0 mais est {balance}"
-
-        data = {
-            "identity_uuid": str(self.identity.id),
-            "matricule": "ST003",
-            "date_entree": "2024-09-01",
-            "program_id": str(self.program.id),
-            "year_id": str(self.year.id),
-            "level": "L1",
-        }
-
-        response = self.client.post(
-            "/api/students/", data, HTTP_X_ROLE_ACTIVE="RECTEUR", format="json"
-        )
+        """Test POST students avec une dette : inscription bloquée"""
+        self.client.force_authenticate(user=self.recteur_user)
+
+        # Dette de 100000 sans écrire de facture. Le code bloque si balance > 0
+        # (dette), malgré le message "solde négatif".
+        with patch.object(
+            StudentsViewSet, "_calculate_balance_for_identity", return_value=Decimal("100000")
+        ):
+            response = self.client.post(
+                "/api/students/", self.enrollment_payload, HTTP_X_ROLE_ACTIVE="RECTEUR"
+            )
 
         assert response.status_code == 400
-        assert "solde" in response.data["detail"].lower() or "bloqu" in response.data["detail"].lower()
+        assert response.data["detail"] == "Inscription bloquée: solde négatif."
+        assert response.data["balance"] == 100000.0
+        assert not StudentProfile.objects.filter(identity=self.identity).exists()
 
 
 @pytest.mark.django_db
-class TestValidateRegistration:
+class TestValidateRegistration(APITestCase):
     """Tests pour validate_registration"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.identity = CoreIdentity.objects.create(
-            email="validator@iuec.cm",
-            phone="690000021",
-            first_name="Validator",
-            last_name="Test",
-            is_active=True,
-        )
-        self.student_identity = CoreIdentity.objects.create(
-            email="student2@iuec.cm",
-            phone="690000022",
-            first_name="Student",
-            last_name="Two",
-            is_active=True,
-        )
-        self.faculty = Faculty.objects.create(
+    client_class = JSONClient
+
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.doyen_role = cls.roles["DOYEN"]
+        factory = IdentityFactory()
+        cls.identity = factory.identity(
+            "validator@iuec.cm", "690000021", "Validator", "Test", role=cls.doyen_role
+        )
+        cls.student_identity = factory.identity("student2@iuec.cm", "690000022", "Student", "Two")
+        cls.user = factory.user(cls.identity)
+        factory.flush()
+        cls.faculty = Faculty.objects.create(
             code="FASE", name="Faculté des Sciences", is_active=True
         )
-        self.program = Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
+        cls.program = Program.objects.create(
+            code="INFO", name="Informatique", faculty=cls.faculty, is_active=True
         )
-        self.year = AcademicYear.objects.create(
+        cls.year = AcademicYear.objects.create(
             code="2024-2025", label="Année 2024-2025", is_active=True
         )
-        self.student_profile = StudentProfile.objects.create(
-            identity=self.student_identity,
+        cls.student_profile = StudentProfile.objects.create(
+            identity=cls.student_identity,
             matricule_permanent="ST004",
-            date_entree=timezone.now().date(),
-            current_program=self.program,
+            date_entree=DATE_ENTREE,
+            current_program=cls.program,
             finance_status=StudentProfile.FinanceStatus.OK,
         )
-        self.registration = RegistrationAdmin.objects.create(
-            student=self.student_profile,
-            year=self.year,
+        cls.registration = RegistrationAdmin.objects.create(
+            student=cls.student_profile,
+            year=cls.year,
             level="L1",
             finance_status=StudentProfile.FinanceStatus.OK,
         )
-        self.doyen_role, _ = RbacRoleDef.objects.get_or_create(
-            code="DOYEN", defaults={"label": "Doyen", "is_active": True}
-        )
 
     def test_validate_registration_success(self):
         """Test validation d'inscription réussie"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="validator@iuec.cm", email="validator@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.user)
 
         data = {
             "registration_id": str(self.registration.id),
             "status": "VALIDATED",
         }
 
-        response = self.client.post(
-            "/api/registrations/validate/",
-            data,
-            HTTP_X_ROLE_ACTIVE="DOYEN",
-            format="json",
-        )
+        response = self.client.post("/api/registrations/validate/", data, HTTP_X_ROLE_ACTIVE="DOYEN")
 
         assert response.status_code == 200
         assert "valid" in response.data.get("detail", "").lower()
 
 
 @pytest.mark.django_db
-class TestGradesEndpoint:
+class TestGradesEndpoint(APITestCase):
     """Tests pour grades_endpoint"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.teacher_identity = CoreIdentity.objects.create(
-            email="teacher@iuec.cm",
-            phone="690000023",
-            first_name="Teacher",
-            last_name="Test",
-            is_active=True,
-        )
-        self.validator_identity = CoreIdentity.objects.create(
-            email="validator_acad@iuec.cm",
-            phone="690000024",
-            first_name="Validator",
-            last_name="Acad",
-            is_active=True,
-        )
-        self.student_identity = CoreIdentity.objects.create(
-            email="student3@iuec.cm",
-            phone="690000025",
-            first_name="Student",
-            last_name="Three",
-            is_active=True,
-        )
-        self.faculty = Faculty.objects.create(
+    client_class = JSONClient
+
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.teacher_role = cls.roles["USER_TEACHER"]
+        cls.validator_role = cls.roles["VALIDATOR_ACAD"]
+        factory = IdentityFactory()
+        cls.teacher_identity = factory.identity(
+            "teacher@iuec.cm", "690000023", "Teacher", "Test", role=cls.teacher_role
+        )
+        cls.validator_identity = factory.identity(
+            "validator_acad@iuec.cm", "690000024", "Validator", "Acad", role=cls.validator_role
+        )
+        cls.student_identity = factory.identity(
+            "student3@iuec.cm", "690000025", "Student", "Three", role=cls.roles["USER_STUDENT"]
+        )
+        cls.teacher_user = factory.user(cls.teacher_identity)
+        cls.validator_user = factory.user(cls.validator_identity)
+        cls.student_user = factory.user(cls.student_identity)
+        factory.flush()
+        cls.faculty = Faculty.objects.create(
             code="FASE", name="Faculté des Sciences", is_active=True
         )
-        self.program = Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
+        cls.program = Program.objects.create(
+            code="INFO", name="Informatique", faculty=cls.faculty, is_active=True
         )
-        self.student_profile = StudentProfile.objects.create(
-            identity=self.student_identity,
+        cls.student_profile = StudentProfile.objects.create(
+            identity=cls.student_identity,
             matricule_permanent="ST005",
-            date_entree=timezone.now().date(),
-            current_program=self.program,
+            date_entree=DATE_ENTREE,
+            current_program=cls.program,
             finance_status=StudentProfile.FinanceStatus.OK,
         )
-        self.course_id = uuid4()
-        self.evaluation = Evaluation.objects.create(
-            course_id=self.course_id,
+        cls.course_id = uuid4()
+        cls.evaluation = Evaluation.objects.create(
+            course_id=cls.course_id,
             type="CC",
             weight=0.3,
             max_score=20,
             is_closed=False,
         )
-        self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_TEACHER", defaults={"label": "Enseignant", "is_active": True}
-        )
-        self.validator_role, _ = RbacRoleDef.objects.get_or_create(
-            code="VALIDATOR_ACAD",
-            defaults={"label": "Validateur Académique", "is_active": True},
-        )
+        cls.grades_view = resolve("/api/grades/").func
+        # Identifiants sérialisés une fois pour les payloads POST
+        cls.evaluation_id_str = str(cls.evaluation.id)
+        cls.student_profile_id_str = str(cls.student_profile.id)
 
     def test_grades_get_validator_acad(self):
         """Test GET grades pour VALIDATOR_ACAD (PV jury)"""
-        IdentityRoleLink.objects.create(
-            identity=self.validator_identity, role=self.validator_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="validator_acad@iuec.cm", email="validator_acad@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.validator_user)
 
         response = self.client.get(
             f"/api/grades/?course_id={self.course_id}",
@@ -343,30 +269,19 @@ class TestGradesEndpoint:
 
     def test_grades_post_teacher(self):
         """Test POST grades pour TEACHER (saisie notes)"""
-        IdentityRoleLink.objects.create(
-            identity=self.teacher_identity, role=self.teacher_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="teacher@iuec.cm", email="teacher@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.teacher_user)
 
         data = {
-            "evaluation_id": str(self.evaluation.id),
+            "evaluation_id": self.evaluation_id_str,
             "grades": [
                 {
-                    "student_uuid": str(self.student_profile.id),
+                    "student_uuid": self.student_profile_id_str,
                     "value": 15.5,
                 }
             ],
         }
 
-        response = self.client.post(
-            "/api/grades/",
-            data,
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-            format="json",
-        )
+        response = self.client.post("/api/grades/", data, HTTP_X_ROLE_ACTIVE="USER_TEACHER")
 
         assert response.status_code == 200
         assert "detail" in response.data
@@ -376,30 +291,19 @@ class TestGradesEndpoint:
         self.evaluation.is_closed = True
         self.evaluation.save()
 
-        IdentityRoleLink.objects.create(
-            identity=self.teacher_identity, role=self.teacher_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="teacher@iuec.cm", email="teacher@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.teacher_user)
 
         data = {
-            "evaluation_id": str(self.evaluation.id),
+            "evaluation_id": self.evaluation_id_str,
             "grades": [
                 {
-                    "student_uuid": str(self.student_profile.id),
+                    "student_uuid": self.student_profile_id_str,
                     "value": 15.5,
                 }
             ],
         }
 
-        response = self.client.post(
-            "/api/grades/",
-            data,
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-            format="json",
-        )
+        response = self.client.post("/api/grades/", data, HTTP_X_ROLE_ACTIVE="USER_TEACHER")
 
         assert response.status_code == 400
         assert "clôturée" in response.data["detail"].lower()
@@ -409,69 +313,56 @@ class TestGradesEndpoint:
         self.student_profile.finance_status = StudentProfile.FinanceStatus.BLOCKED
         self.student_profile.save()
 
-        student_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_STUDENT", defaults={"label": "Étudiant", "is_active": True}
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.student_identity, role=student_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="student3@iuec.cm", email="student3@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        response = self.client.get(
-            "/api/grades/", HTTP_X_ROLE_ACTIVE="USER_STUDENT"
-        )
+        response = call_view(self.grades_view, "/api/grades/", self.student_user, "USER_STUDENT")
 
         assert response.status_code == 403
 
 
 @pytest.mark.django_db
-class TestValidateGrades:
+class TestValidateGrades(APITestCase):
     """Tests pour validate_grades"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.validator_identity = CoreIdentity.objects.create(
+    client_class = JSONClient
+
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.validator_identity = CoreIdentity.objects.create(
             email="validator2@iuec.cm",
             phone="690000026",
             first_name="Validator",
             last_name="Two",
             is_active=True,
         )
-        self.course_id = uuid4()
-        self.evaluation = Evaluation.objects.create(
-            course_id=self.course_id,
+        cls.course_id = uuid4()
+        cls.evaluation = Evaluation.objects.create(
+            course_id=cls.course_id,
             type="CC",
             weight=0.3,
             max_score=20,
             is_closed=False,
         )
-        self.validator_role, _ = RbacRoleDef.objects.get_or_create(
-            code="VALIDATOR_ACAD",
-            defaults={"label": "Validateur Académique", "is_active": True},
+        cls.validator_role = cls.roles["VALIDATOR_ACAD"]
+        # Rôles des deux tests (validateur, étudiant non autorisé) en un seul INSERT
+        IdentityRoleLink.objects.bulk_create(
+            [
+                IdentityRoleLink(identity=cls.validator_identity, role=role, is_active=True)
+                for role in (cls.validator_role, cls.roles["USER_STUDENT"])
+            ],
+            ignore_conflicts=True,
         )
+        cls.user = make_user("validator2@iuec.cm")
+        cls.validate_view = resolve("/api/grades/validate/").func
+        cls.course_id_str = str(cls.course_id)
 
     def test_validate_grades_success(self):
         """Test validation de notes réussie"""
-        IdentityRoleLink.objects.create(
-            identity=self.validator_identity, role=self.validator_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="validator2@iuec.cm", email="validator2@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.user)
 
-        data = {"course_id": str(self.course_id)}
+        data = {"course_id": self.course_id_str}
 
-        response = self.client.post(
-            "/api/grades/validate/",
-            data,
-            HTTP_X_ROLE_ACTIVE="VALIDATOR_ACAD",
-            format="json",
-        )
+        response = self.client.post("/api/grades/validate/", data, HTTP_X_ROLE_ACTIVE="VALIDATOR_ACAD")
 
         assert response.status_code == 200
         # Vérifier que l'évaluation est clôturée
@@ -480,72 +371,48 @@ class TestValidateGrades:
 
     def test_validate_grades_unauthorized_role(self):
         """Test validation avec rôle non autorisé"""
-        student_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_STUDENT", defaults={"label": "Étudiant", "is_active": True}
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.validator_identity, role=student_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="validator2@iuec.cm", email="validator2@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        data = {"course_id": str(self.course_id)}
+        data = {"course_id": self.course_id_str}
 
-        response = self.client.post(
-            "/api/grades/validate/",
-            data,
-            HTTP_X_ROLE_ACTIVE="USER_STUDENT",
-            format="json",
+        response = call_view(
+            self.validate_view, "/api/grades/validate/", self.user, "USER_STUDENT", data, method="post"
         )
 
         assert response.status_code == 403
 
 
 @pytest.mark.django_db
-class TestDashboardEndpoint:
+class TestDashboardEndpoint(APITestCase):
     """Tests pour dashboard_data endpoint"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.recteur_identity = CoreIdentity.objects.create(
-            email="recteur@iuec.cm",
-            phone="690000030",
-            first_name="Recteur",
-            last_name="Test",
-            is_active=True,
-        )
-        self.teacher_identity = CoreIdentity.objects.create(
-            email="teacher@iuec.cm",
-            phone="690000031",
-            first_name="Teacher",
-            last_name="Test",
-            is_active=True,
-        )
-        self.recteur_role, _ = RbacRoleDef.objects.get_or_create(
-            code="RECTEUR", defaults={"label": "Recteur", "is_active": True}
-        )
-        self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_TEACHER", defaults={"label": "Enseignant", "is_active": True}
-        )
-        self.faculty = Faculty.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.recteur_role = cls.roles["RECTEUR"]
+        cls.teacher_role = cls.roles["USER_TEACHER"]
+        factory = IdentityFactory()
+        cls.recteur_identity = factory.identity(
+            "recteur@iuec.cm", "690000030", "Recteur", "Test", role=cls.recteur_role
+        )
+        cls.teacher_identity = factory.identity(
+            "teacher@iuec.cm", "690000031", "Teacher", "Test", role=cls.teacher_role
+        )
+        cls.recteur_user = factory.user(cls.recteur_identity)
+        cls.teacher_user = factory.user(cls.teacher_identity)
+        factory.flush()
+        # Utilisateur sans identité ni rôle
+        cls.no_role_user = make_user("user@iuec.cm")
+        cls.dashboard_view = resolve("/api/dashboard/").func
+        cls.faculty = Faculty.objects.create(
             code="FASE", name="Faculté des Sciences", is_active=True
         )
-        self.program = Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
+        cls.program = Program.objects.create(
+            code="INFO", name="Informatique", faculty=cls.faculty, is_active=True
         )
 
     def test_dashboard_recteur_success(self):
         """Test GET /api/dashboard/ avec rôle RECTEUR → status 200 + structure kpi/graph"""
-        IdentityRoleLink.objects.create(
-            identity=self.recteur_identity, role=self.recteur_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="recteur@iuec.cm", email="recteur@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.recteur_user)
 
         # Créer quelques données pour les KPIs
         student_identity = CoreIdentity.objects.create(
@@ -558,7 +425,7 @@ class TestDashboardEndpoint:
         StudentProfile.objects.create(
             identity=student_identity,
             matricule_permanent="ST001",
-            date_entree=timezone.now().date(),
+            date_entree=DATE_ENTREE,
             current_program=self.program,
             finance_status=StudentProfile.FinanceStatus.OK,
         )
@@ -569,9 +436,11 @@ class TestDashboardEndpoint:
             status=Invoice.STATUS_PAID,
         )
 
-        response = self.client.get(
-            "/api/dashboard/", HTTP_X_ROLE_ACTIVE="RECTEUR"
-        )
+        # Rôles (2) + agrégats KPI (10), sans boucle par ligne
+        with self.assertNumQueries(12):
+            response = self.client.get(
+                "/api/dashboard/", HTTP_X_ROLE_ACTIVE="RECTEUR"
+            )
 
         assert response.status_code == 200
         assert "kpis" in response.data
@@ -584,13 +453,7 @@ class TestDashboardEndpoint:
 
     def test_dashboard_teacher_success(self):
         """Test GET /api/dashboard/ avec rôle TEACHER → status 200 + données limitées"""
-        IdentityRoleLink.objects.create(
-            identity=self.teacher_identity, role=self.teacher_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="teacher@iuec.cm", email="teacher@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
+        self.client.force_authenticate(user=self.teacher_user)
 
         response = self.client.get(
             "/api/dashboard/", HTTP_X_ROLE_ACTIVE="USER_TEACHER"
@@ -604,155 +467,124 @@ class TestDashboardEndpoint:
 
     def test_dashboard_no_role(self):
         """Test GET /api/dashboard/ sans rôle actif → status 400"""
-        user = User.objects.create_user(
-            username="user@iuec.cm", email="user@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        response = self.client.get("/api/dashboard/")
+        response = call_view(self.dashboard_view, "/api/dashboard/", self.no_role_user, None)
 
         assert response.status_code == 400
         assert "Rôle actif requis" in response.data["detail"]
 
 
 @pytest.mark.django_db
-class TestGradesEndpointInvalidPayload:
+class TestGradesEndpointInvalidPayload(APITestCase):
     """Tests pour grades_endpoint avec payload invalide"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.teacher_identity = CoreIdentity.objects.create(
+    client_class = JSONClient
+
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.teacher_identity = CoreIdentity.objects.create(
             email="teacher2@iuec.cm",
             phone="690000032",
             first_name="Teacher",
             last_name="Two",
             is_active=True,
         )
-        self.teacher_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_TEACHER", defaults={"label": "Enseignant", "is_active": True}
-        )
+        cls.teacher_role = cls.roles["USER_TEACHER"]
         IdentityRoleLink.objects.create(
-            identity=self.teacher_identity, role=self.teacher_role, is_active=True
-        )
-        self.user = User.objects.create_user(
-            username="teacher2@iuec.cm", email="teacher2@iuec.cm"
-        )
+            identity=cls.teacher_identity, role=cls.teacher_role, is_active=True
+        )
+        cls.user = make_user("teacher2@iuec.cm")
+        # (cas, payload, sous-chaînes acceptées dans le message d'erreur)
+        # grades=None et non "absent" : payload.get("grades", []) renverrait une liste.
+        # Le payload est validé avant toute lecture de l'évaluation : un id quelconque suffit
+        cls.invalid_payload_cases = [
+            (
+                "missing_evaluation_id",
+                {"grades": [{"student_uuid": str(uuid4()), "value": 15.5}]},
+                ("evaluation_id",),
+            ),
+            (
+                "missing_grades",
+                {"evaluation_id": str(uuid4()), "grades": None},
+                ("grades", "evaluation_id"),
+            ),
+            (
+                "invalid_grades_type",
+                {"evaluation_id": str(uuid4()), "grades": "not_a_list"},
+                ("grades",),
+            ),
+        ]
+
+    def setUp(self):
+        """Authentification du client, recréé avant chaque test"""
         self.client.force_authenticate(user=self.user)
 
-    def test_grades_post_missing_evaluation_id(self):
-        """Test POST /api/grades/ avec payload invalide (evaluation_id manquant) → 400"""
-        data = {"grades": [{"student_uuid": str(uuid4()), "value": 15.5}]}
+    def test_grades_post_invalid_payloads(self):
+        """Test POST /api/grades/ avec payloads invalides (evaluation_id manquant, grades absent ou non-liste) → 400"""
+        # Un seul test (une authentification) pour les trois payloads, un subTest par cas
+        for case, data, expected_substrs in self.invalid_payload_cases:
+            with self.subTest(case=case):
+                response = self.client.post("/api/grades/", data, HTTP_X_ROLE_ACTIVE="USER_TEACHER")
 
-        response = self.client.post(
-            "/api/grades/",
-            data,
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-            format="json",
-        )
-
-        assert response.status_code == 400
-        assert "evaluation_id" in response.data["detail"].lower()
-
-    def test_grades_post_missing_grades(self):
-        """Test POST /api/grades/ avec payload invalide (grades manquant) → 400"""
-        # Créer une évaluation pour avoir un evaluation_id valide
-        evaluation = Evaluation.objects.create(
-            course_id=uuid4(),
-            type="CC",
-            weight=0.3,
-            max_score=20,
-            is_closed=False,
-        )
-        # Envoyer seulement evaluation_id sans grades
-        data = {"evaluation_id": str(evaluation.id)}
-        # Le code vérifie: if not evaluation_id or not isinstance(grades_payload, list):
-        # grades_payload = payload.get("grades", []) - donc si grades n'est pas fourni, ce sera []
-        # [] est une liste, donc isinstance([], list) est True
-        # Il faut envoyer grades avec une valeur non-liste ou ne pas l'envoyer du tout
-        # Mais si on ne l'envoie pas, payload.get("grades", []) retourne [], qui est une liste
-        # Donc le test devrait passer. Le problème peut être que le code vérifie d'abord le rôle
-        # Vérifions en envoyant grades=None ou grades="not_a_list"
-        data = {"evaluation_id": str(evaluation.id), "grades": None}
-
-        response = self.client.post(
-            "/api/grades/",
-            data,
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-            format="json",
-        )
-
-        # Si grades=None, isinstance(None, list) est False, donc ça devrait retourner 400
-        assert response.status_code == 400
-        assert "grades" in response.data["detail"].lower() or "evaluation_id" in response.data["detail"].lower()
-
-    def test_grades_post_invalid_grades_type(self):
-        """Test POST /api/grades/ avec payload invalide (grades n'est pas une liste) → 400"""
-        data = {"evaluation_id": str(uuid4()), "grades": "not_a_list"}
-
-        response = self.client.post(
-            "/api/grades/",
-            data,
-            HTTP_X_ROLE_ACTIVE="USER_TEACHER",
-            format="json",
-        )
-
-        assert response.status_code == 400
-        assert "grades" in response.data["detail"].lower()
+                assert response.status_code == 400
+                detail = response.data["detail"].lower()
+                assert any(substr in detail for substr in expected_substrs), detail
 
 
 @pytest.mark.django_db
-class TestStudentsEndpointPagination:
+class TestStudentsEndpointPagination(APITestCase):
     """Tests pour students_endpoint avec pagination"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.recteur_identity = CoreIdentity.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.recteur_identity = CoreIdentity.objects.create(
             email="recteur3@iuec.cm",
             phone="690000033",
             first_name="Recteur",
             last_name="Three",
             is_active=True,
         )
-        self.recteur_role, _ = RbacRoleDef.objects.get_or_create(
-            code="RECTEUR", defaults={"label": "Recteur", "is_active": True}
-        )
+        cls.recteur_role = cls.roles["RECTEUR"]
         IdentityRoleLink.objects.create(
-            identity=self.recteur_identity, role=self.recteur_role, is_active=True
-        )
-        self.user = User.objects.create_user(
-            username="recteur3@iuec.cm", email="recteur3@iuec.cm"
+            identity=cls.recteur_identity, role=cls.recteur_role, is_active=True
         )
-        self.client.force_authenticate(user=self.user)
-        self.faculty = Faculty.objects.create(
+        cls.user = make_user("recteur3@iuec.cm")
+        cls.faculty = Faculty.objects.create(
             code="FASE", name="Faculté des Sciences", is_active=True
         )
-        self.program = Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
+        cls.program = Program.objects.create(
+            code="INFO", name="Informatique", faculty=cls.faculty, is_active=True
         )
         # Créer plusieurs étudiants pour tester la pagination
+        # (un INSERT groupé pour les identités, un pour les profils)
+        factory = IdentityFactory()
         for i in range(15):
-            student_identity = CoreIdentity.objects.create(
-                email=f"student{i}@iuec.cm",
-                phone=f"6900000{i:02d}",
-                first_name=f"Student{i}",
-                last_name="Test",
-                is_active=True,
+            student_identity = factory.identity(
+                f"student{i}@iuec.cm", f"6900000{i:02d}", f"Student{i}", "Test"
             )
-            StudentProfile.objects.create(
-                identity=student_identity,
-                matricule_permanent=f"ST{i:03d}",
-                date_entree=timezone.now().date(),
-                current_program=self.program,
+            factory.student_profile(
+                student_identity,
+                cls.program,
+                f"ST{i:03d}",
+                DATE_ENTREE,
                 finance_status=StudentProfile.FinanceStatus.OK,
             )
+        factory.flush()
+
+    def setUp(self):
+        """Authentification du client, recréé avant chaque test"""
+        self.client.force_authenticate(user=self.user)
 
     def test_students_get_pagination_page_2(self):
         """Test GET /api/students/ pagination (page=2) → status 200"""
-        response = self.client.get(
-            "/api/students/?page=2", HTTP_X_ROLE_ACTIVE="RECTEUR"
-        )
+        # Comptage + page d'étudiants en select_related, pas de requête par ligne
+        with self.assertNumQueries(2):
+            response = self.client.get(
+                "/api/students/?page=2", HTTP_X_ROLE_ACTIVE="RECTEUR"
+            )
 
         assert response.status_code == 200
         # Vérifier que la réponse contient des données (structure peut varier selon l'implémentation)
@@ -760,47 +592,49 @@ class TestStudentsEndpointPagination:
 
 
 @pytest.mark.django_db
-class TestFacultiesEndpoint:
+class TestFacultiesEndpoint(APITestCase):
     """Tests pour /api/faculties/ endpoint"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.faculty = Faculty.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.faculty = Faculty.objects.create(
             code="FASE", name="Faculté des Sciences", is_active=True
         )
+        cls.faculties_view = resolve("/api/faculties/").func
 
     def test_faculties_get_without_auth(self):
         """Test GET /api/faculties/ sans auth → 401"""
-        response = self.client.get("/api/faculties/")
+        response = call_view(self.faculties_view, "/api/faculties/", None, None)
 
         assert response.status_code == 401
 
 
 @pytest.mark.django_db
-class TestSoDViolation:
+class TestSoDViolation(APITestCase):
     """Tests pour violations SoD dans les vues custom"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.rh_identity = CoreIdentity.objects.create(
+    client_class = JSONClient
+
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.rh_identity = CoreIdentity.objects.create(
             email="rh@iuec.cm",
             phone="690000050",
             first_name="RH",
             last_name="Manager",
             is_active=True,
         )
-        self.rh_role, _ = RbacRoleDef.objects.get_or_create(
-            code="MANAGER_RH_PAY",
-            defaults={"label": "Manager RH Pay", "is_active": True},
-        )
+        cls.rh_role = cls.roles["MANAGER_RH_PAY"]
         IdentityRoleLink.objects.create(
-            identity=self.rh_identity, role=self.rh_role, is_active=True
-        )
-        self.user = User.objects.create_user(
-            username="rh@iuec.cm", email="rh@iuec.cm"
+            identity=cls.rh_identity, role=cls.rh_role, is_active=True
         )
+        cls.user = make_user("rh@iuec.cm")
+
+    def setUp(self):
+        """Authentification du client, recréé avant chaque test"""
         self.client.force_authenticate(user=self.user)
 
     def test_sod_violation_self_salary(self):
@@ -815,12 +649,7 @@ class TestSoDViolation:
 
         # Le middleware vérifie les requêtes POST/PUT/PATCH avec identity_uuid == beneficiary_uuid
         # Utiliser un endpoint qui passe par le middleware (n'importe quel endpoint POST)
-        response = self.client.post(
-            "/api/students/",
-            data,
-            HTTP_X_ROLE_ACTIVE="MANAGER_RH_PAY",
-            format="json",
-        )
+        response = self.client.post("/api/students/", data, HTTP_X_ROLE_ACTIVE="MANAGER_RH_PAY")
 
         # Le middleware devrait retourner 403 pour violation SoD
         # Le middleware retourne un JsonResponse, pas un Response DRF
@@ -835,28 +664,33 @@ class TestSoDViolation:
 
 
 @pytest.mark.django_db
-class TestDashboardOtherRoles:
+class TestDashboardOtherRoles(APITestCase):
     """Tests pour dashboard_data avec d'autres rôles"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.student_identity = CoreIdentity.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.roles = seed_roles()
+        cls.student_identity = CoreIdentity.objects.create(
             email="student_dash@iuec.cm",
             phone="690000060",
             first_name="Student",
             last_name="Dash",
             is_active=True,
         )
-        self.student_role, _ = RbacRoleDef.objects.get_or_create(
-            code="USER_STUDENT", defaults={"label": "Étudiant", "is_active": True}
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.student_identity, role=self.student_role, is_active=True
-        )
-        self.user = User.objects.create_user(
-            username="student_dash@iuec.cm", email="student_dash@iuec.cm"
+        cls.student_role = cls.roles["USER_STUDENT"]
+        IdentityRoleLink.objects.bulk_create(
+            [
+                IdentityRoleLink(identity=cls.student_identity, role=role, is_active=True)
+                for role in (cls.student_role, cls.roles["UNKNOWN_ROLE"])
+            ],
+            ignore_conflicts=True,
         )
+        cls.user = make_user("student_dash@iuec.cm")
+        cls.dashboard_view = resolve("/api/dashboard/").func
+
+    def setUp(self):
+        """Authentification du client, recréé avant chaque test"""
         self.client.force_authenticate(user=self.user)
 
     def test_dashboard_student_success(self):
@@ -874,17 +708,9 @@ class TestDashboardOtherRoles:
         """Test GET /api/dashboard/ avec rôle inconnu → status 200 + message"""
         # Le code vérifie d'abord si l'utilisateur a le rôle
         # Si l'utilisateur n'a pas le rôle, il retourne 403
-        # Pour tester un rôle inconnu, il faut que l'utilisateur ait ce rôle
-        unknown_role, _ = RbacRoleDef.objects.get_or_create(
-            code="UNKNOWN_ROLE", defaults={"label": "Unknown Role", "is_active": True}
-        )
-        IdentityRoleLink.objects.create(
-            identity=self.student_identity, role=unknown_role, is_active=True
-        )
-        
-        response = self.client.get(
-            "/api/dashboard/", HTTP_X_ROLE_ACTIVE="UNKNOWN_ROLE"
-        )
+        # Pour tester un rôle inconnu, il faut que l'utilisateur ait ce rôle (lien créé
+        # dans setUpTestData)
+        response = call_view(self.dashboard_view, "/api/dashboard/", self.user, "UNKNOWN_ROLE")
 
         assert response.status_code == 200
         assert "message" in response.data
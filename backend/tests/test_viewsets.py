@@ -1,114 +1,75 @@
 """Tests pour api/viewsets.py"""
 import pytest
-from django.contrib.auth.models import User
-from rest_framework.test import APIClient
+from rest_framework.test import APITestCase, force_authenticate
 
 from apps.academic.models import Faculty, Program
-from identity.models import CoreIdentity, IdentityRoleLink, RbacRoleDef
+from identity.models import CoreIdentity, IdentityRoleLink
+
+from .factories import list_results, make_user, seed_roles
 
 
 @pytest.mark.django_db
-class TestFacultyViewSet:
+class TestFacultyViewSet(APITestCase):
     """Tests pour FacultyViewSet"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.identity = CoreIdentity.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.identity = CoreIdentity.objects.create(
             email="doyen@iuec.cm",
             phone="690000010",
             first_name="Doyen",
             last_name="Test",
             is_active=True,
         )
-        self.recteur_role, _ = RbacRoleDef.objects.get_or_create(
-            code="RECTEUR", defaults={"label": "Recteur", "is_active": True}
-        )
-        self.doyen_role, _ = RbacRoleDef.objects.get_or_create(
-            code="DOYEN", defaults={"label": "Doyen", "is_active": True}
-        )
-        self.admin_role, _ = RbacRoleDef.objects.get_or_create(
-            code="ADMIN_SI", defaults={"label": "Admin SI", "is_active": True}
-        )
-
-    def test_faculty_list_recteur(self):
-        """Test liste des facultés pour RECTEUR (accès global)"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.recteur_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        faculty1 = Faculty.objects.create(
-            code="FASE", name="Faculté des Sciences", is_active=True
-        )
-        faculty2 = Faculty.objects.create(
-            code="FST", name="Faculté des Sciences et Techniques", is_active=True
-        )
-
-        request = self.client.get("/api/faculties/")
-        request.role_active = "RECTEUR"
-        # Simuler le middleware
-        response = self.client.get("/api/faculties/", HTTP_X_ROLE_ACTIVE="RECTEUR")
-
-        assert response.status_code == 200
-        # response.data peut être une liste ou un dict selon la pagination
-        if isinstance(response.data, list):
-            results = response.data
-        else:
-            results = response.data.get("results", [])
-        assert len(results) >= 2
-
-    def test_faculty_list_doyen_own_faculty(self):
-        """Test liste des facultés pour DOYEN (sa propre faculté)"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        faculty = Faculty.objects.create(
-            code="FASE",
-            name="Faculté des Sciences",
-            doyen_uuid=self.identity,
-            is_active=True,
-        )
-        other_faculty = Faculty.objects.create(
-            code="FST",
-            name="Faculté des Sciences et Techniques",
-            is_active=True,
-        )
-
-        response = self.client.get("/api/faculties/", HTTP_X_ROLE_ACTIVE="DOYEN")
-
-        assert response.status_code == 200
-        # response.data peut être une liste ou un dict selon la pagination
-        if isinstance(response.data, list):
-            results = response.data
-        else:
-            results = response.data.get("results", [])
-        faculty_codes = [f["code"] for f in results]
-        assert "FASE" in faculty_codes
-        # Ne devrait pas voir FST si ce n'est pas sa faculté
-        # (selon la logique de get_queryset)
+        cls.roles = seed_roles()
+        cls.recteur_role = cls.roles["RECTEUR"]
+        cls.doyen_role = cls.roles["DOYEN"]
+        cls.admin_role = cls.roles["ADMIN_SI"]
+        # Rôles RECTEUR et DOYEN pour tous les tests : le rôle actif (header) choisit
+        IdentityRoleLink.objects.bulk_create(
+            [
+                IdentityRoleLink(identity=cls.identity, role=role, is_active=True)
+                for role in (cls.recteur_role, cls.doyen_role)
+            ]
+        )
+        cls.user = make_user("doyen@iuec.cm")
+        # Jeu de lecture partagé : FASE dirigée par le doyen, FST par personne
+        cls.faculty, cls.other_faculty = Faculty.objects.bulk_create(
+            [
+                Faculty(
+                    code="FASE",
+                    name="Faculté des Sciences",
+                    doyen_uuid=cls.identity,
+                    is_active=True,
+                ),
+                Faculty(
+                    code="FST",
+                    name="Faculté des Sciences et Techniques",
+                    is_active=True,
+                ),
+            ]
+        )
+
+    def setUp(self):
+        """Authentification du client, recréé avant chaque test"""
+        self.client.force_authenticate(user=self.user)
+
+    def test_faculty_list_by_role(self):
+        """Test liste des facultés : toutes pour RECTEUR, la sienne seule pour DOYEN"""
+        cases = (("RECTEUR", {"FASE", "FST"}), ("DOYEN", {"FASE"}))
+        for role, expected_codes in cases:
+            with self.subTest(role=role):
+                response = self.client.get("/api/faculties/", HTTP_X_ROLE_ACTIVE=role)
+
+                assert response.status_code == 200
+                assert {f["code"] for f in list_results(response)} == expected_codes
 
     def test_faculty_create_doyen(self):
         """Test création de faculté par DOYEN"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
         data = {
-            "code": "FASE",
-            "name": "Faculté des Sciences",
+            "code": "FSJP",
+            "name": "Faculté des Sciences Juridiques et Politiques",
             "tutelle": "Ministère",
             "is_active": True,
         }
@@ -122,25 +83,10 @@ class TestFacultyViewSet:
 
     def test_faculty_update_doyen(self):
         """Test mise à jour de faculté par DOYEN"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        faculty = Faculty.objects.create(
-            code="FASE",
-            name="Faculté des Sciences",
-            doyen_uuid=self.identity,
-            is_active=True,
-        )
-
         data = {"name": "Faculté des Sciences Mise à Jour"}
 
         response = self.client.patch(
-            f"/api/faculties/{faculty.id}/",
+            f"/api/faculties/{self.faculty.id}/",
             data,
             HTTP_X_ROLE_ACTIVE="DOYEN",
             format="json",
@@ -150,85 +96,56 @@ class TestFacultyViewSet:
 
 
 @pytest.mark.django_db
-class TestProgramViewSet:
+class TestProgramViewSet(APITestCase):
     """Tests pour ProgramViewSet"""
 
-    def setup_method(self):
-        """Setup pour chaque test"""
-        self.client = APIClient()
-        self.identity = CoreIdentity.objects.create(
+    @classmethod
+    def setUpTestData(cls):
+        """Données créées une fois pour toute la classe (rollback en fin de classe)"""
+        cls.identity = CoreIdentity.objects.create(
             email="doyen@iuec.cm",
             phone="690000011",
             first_name="Doyen",
             last_name="Test",
             is_active=True,
         )
-        self.faculty = Faculty.objects.create(
+        cls.faculty = Faculty.objects.create(
             code="FASE",
             name="Faculté des Sciences",
-            doyen_uuid=self.identity,
+            doyen_uuid=cls.identity,
             is_active=True,
         )
-        self.recteur_role, _ = RbacRoleDef.objects.get_or_create(
-            code="RECTEUR", defaults={"label": "Recteur", "is_active": True}
+        cls.roles = seed_roles()
+        cls.recteur_role = cls.roles["RECTEUR"]
+        cls.doyen_role = cls.roles["DOYEN"]
+        # Rôles RECTEUR et DOYEN pour tous les tests : le rôle actif (header) choisit
+        IdentityRoleLink.objects.bulk_create(
+            [
+                IdentityRoleLink(identity=cls.identity, role=role, is_active=True)
+                for role in (cls.recteur_role, cls.doyen_role)
+            ]
         )
-        self.doyen_role, _ = RbacRoleDef.objects.get_or_create(
-            code="DOYEN", defaults={"label": "Doyen", "is_active": True}
+        cls.user = make_user("doyen@iuec.cm")
+        # Programme lu par les tests de liste
+        cls.program = Program.objects.create(
+            code="INFO", name="Informatique", faculty=cls.faculty, is_active=True
         )
 
-    def test_program_list_recteur(self):
-        """Test liste des programmes pour RECTEUR (accès global)"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.recteur_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
-        )
+    def setUp(self):
+        """Authentification du client, recréé avant chaque test"""
+        self.client.force_authenticate(user=self.user)
 
-        response = self.client.get("/api/programs/", HTTP_X_ROLE_ACTIVE="RECTEUR")
+    def test_program_list_by_role(self):
+        """Test liste des programmes pour RECTEUR (accès global) et DOYEN (sa faculté)"""
+        for role in ("RECTEUR", "DOYEN"):
+            with self.subTest(role=role):
+                response = self.client.get("/api/programs/", HTTP_X_ROLE_ACTIVE=role)
 
-        assert response.status_code == 200
-
-    def test_program_list_doyen_own_faculty(self):
-        """Test liste des programmes pour DOYEN (sa propre faculté)"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
-        program = Program.objects.create(
-            code="INFO", name="Informatique", faculty=self.faculty, is_active=True
-        )
-
-        response = self.client.get("/api/programs/", HTTP_X_ROLE_ACTIVE="DOYEN")
-
-        assert response.status_code == 200
-        # response.data peut être une liste ou un dict selon la pagination
-        if isinstance(response.data, list):
-            results = response.data
-        else:
-            results = response.data.get("results", [])
-        program_codes = [p["code"] for p in results]
-        assert "INFO" in program_codes
+                assert response.status_code == 200
+                assert {p["code"] for p in list_results(response)} == {"INFO"}
 
     def test_program_create_doyen_authorized_faculty(self):
         """Test création de programme par DOYEN pour sa faculté"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
         data = {
             "code": "MATH",
             "name": "Mathématiques",
@@ -244,9 +161,6 @@ class TestProgramViewSet:
 
     def test_program_create_doyen_unauthorized_faculty(self):
         """Test création de programme par DOYEN pour une autre faculté"""
-        IdentityRoleLink.objects.create(
-            identity=self.identity, role=self.doyen_role, is_active=True
-        )
         other_identity = CoreIdentity.objects.create(
             email="other@iuec.cm",
             phone="690000012",
@@ -261,11 +175,6 @@ class TestProgramViewSet:
             is_active=True,
         )
 
-        user = User.objects.create_user(
-            username="doyen@iuec.cm", email="doyen@iuec.cm"
-        )
-        self.client.force_authenticate(user=user)
-
         data = {
             "code": "PHYS",
             "name": "Physique",
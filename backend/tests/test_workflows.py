@@ -4,7 +4,6 @@ import uuid
 from decimal import Decimal
 
 import pytest
-from django.contrib.auth.models import User
 from django.utils import timezone
 from rest_framework.test import APIClient
 
@@ -15,9 +14,13 @@ from apps.academic.models import (
     Program,
     RegistrationAdmin,
     RegistrationPedagogical,
-    StudentProfile,
 )
-from identity.models import CoreIdentity, SysAuditLog
+from identity.models import SysAuditLog
+
+from .factories import IdentityFactory, make_user
+
+# Identifiant de cours fixe : requêtes et sorties reproductibles d'un run à l'autre
+COURSE_ID = uuid.UUID("00000000-0000-0000-0000-000000000001")
 
 
 @pytest.mark.django_db
@@ -34,37 +37,36 @@ def test_workflow_jury_to_certificate() -> None:
     )
     year = AcademicYear.objects.create(code="2024-2025", label="2024-2025", is_active=True)
 
-    student_identity = CoreIdentity.objects.create(
+    factory = IdentityFactory()
+    student_identity = factory.identity(
         email="student@example.com",
         phone="90011",
         first_name="Student",
         last_name="Test",
     )
-    student_profile = StudentProfile.objects.create(
-        identity=student_identity,
-        matricule_permanent="M001",
-        date_entree=timezone.now().date(),
-        current_program=program,
-    )
-    registration = RegistrationAdmin.objects.create(
-        student=student_profile,
-        academic_year=year,
-        level="L1",
-        finance_status="OK",
-    )
-
-    teacher_identity = CoreIdentity.objects.create(
+    teacher_identity = factory.identity(
         email="teacher@example.com",
         phone="90012",
         first_name="Teacher",
         last_name="Test",
         metadata={"scope_by_role": {"USER_TEACHER": "FASE"}},
     )
-    teacher_user = User.objects.create_user(
-        username="teacher", email=teacher_identity.email, password="secret"
+    teacher_user = factory.user(teacher_identity)
+    student_profile = factory.student_profile(
+        student_identity, program, "M001", timezone.now().date()
+    )
+    factory.flush()
+    # Validateur et scolarité : simples User, sans identité
+    validator_user = make_user("validator@example.com", username="validator")
+    scolarite_user = make_user("scolarite@example.com", username="scolarite")
+    registration = RegistrationAdmin.objects.create(
+        student=student_profile,
+        academic_year=year,
+        level="L1",
+        finance_status="OK",
     )
 
-    course_id = uuid.uuid4()
+    course_id = COURSE_ID
     evaluation = Evaluation.objects.create(
         course_id=course_id,
         type=Evaluation.EvaluationType.CC,
@@ -87,9 +89,6 @@ def test_workflow_jury_to_certificate() -> None:
     )
     assert response.status_code == 200
 
-    validator_user = User.objects.create_user(
-        username="validator", email="validator@example.com", password="secret"
-    )
     client.force_authenticate(user=validator_user)
     response = client.post(
         "/api/grades/validate/",
@@ -104,9 +103,6 @@ def test_workflow_jury_to_certificate() -> None:
         registration=registration, teaching_unit_id=course_id
     ).exists()
 
-    scolarite_user = User.objects.create_user(
-        username="scolarite", email="scolarite@example.com", password="secret"
-    )
     client.force_authenticate(user=scolarite_user)
     response = client.post(
         "/api/workflows/",
@@ -0,0 +1,11 @@
+"""
+Chemins partagés par les scripts de génération de la documentation de déploiement.
+"""
+
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+DOCS_DIR = BASE_DIR / "docs"
+MD_FILE = DOCS_DIR / "DEPLOIEMENT_RENDER_COMPLET.md"
+HTML_FILE = DOCS_DIR / "DEPLOIEMENT_RENDER_COMPLET.html"
+PDF_FILE = DOCS_DIR / "DEPLOIEMENT_RENDER_COMPLET.pdf"
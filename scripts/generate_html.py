@@ -5,94 +5,130 @@ Le HTML peut être imprimé en PDF depuis le navigateur (Ctrl+P > Enregistrer en
 """
 
 import re
-from pathlib import Path
 
-BASE_DIR = Path(__file__).parent.parent
-MD_FILE = BASE_DIR / "docs" / "DEPLOIEMENT_RENDER_COMPLET.md"
-HTML_FILE = BASE_DIR / "docs" / "DEPLOIEMENT_RENDER_COMPLET.html"
+try:
+    from markdown_it import MarkdownIt
+except ImportError:  # pragma: no cover - dépendance optionnelle
+    MarkdownIt = None
+
+from _paths import HTML_FILE, MD_FILE
+
+
+# Segments en ligne (une seule passe par ligne) : gras, italique, code
+INLINE_RE = re.compile(r'\*\*([^*]+)\*\*|\*([^*]+)\*|`([^`]+)`')
+# Élément de liste numérotée : le groupe capture le texte après « N. »
+ORDERED_ITEM_RE = re.compile(r'\d+\. (.*)')
+
+
+def _inline_span(match: re.Match) -> str:
+    bold, italic, code = match.groups()
+    if bold is not None:
+        return f'<strong>{bold}</strong>'
+    if italic is not None:
+        return f'<em>{italic}</em>'
+    return f'<code>{code}</code>'
+
+
+def _inline(text: str) -> str:
+    return INLINE_RE.sub(_inline_span, text)
+
+
+# Parseur CommonMark (+ tableaux) construit une seule fois, si markdown-it-py est installé
+_MD_PARSER = MarkdownIt("commonmark").enable("table") if MarkdownIt is not None else None
 
 
 def markdown_to_html(md_content: str) -> str:
-    """Convertir Markdown en HTML basique."""
-    html = md_content
-    
-    # Titres
-    html = re.sub(r'^# (.+)$', r'<h1>\1</h1>', html, flags=re.MULTILINE)
-    html = re.sub(r'^## (.+)$', r'<h2>\1</h2>', html, flags=re.MULTILINE)
-    html = re.sub(r'^### (.+)$', r'<h3>\1</h3>', html, flags=re.MULTILINE)
-    
-    # Code blocks
-    html = re.sub(
-        r'```(\w+)?\n(.*?)```',
-        r'<pre><code class="language-\1">\2</code></pre>',
-        html,
-        flags=re.DOTALL
-    )
-    
-    # Inline code
-    html = re.sub(r'`([^`]+)`', r'<code>\1</code>', html)
-    
-    # Listes à puces
-    html = re.sub(r'^- (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-    html = re.sub(r'(<li>.*</li>)', r'<ul>\1</ul>', html, flags=re.DOTALL)
-    
-    # Listes numérotées
-    html = re.sub(r'^\d+\. (.+)$', r'<li>\1</li>', html, flags=re.MULTILINE)
-    
-    # Gras
-    html = re.sub(r'\*\*([^*]+)\*\*', r'<strong>\1</strong>', html)
-    
-    # Italique
-    html = re.sub(r'\*([^*]+)\*', r'<em>\1</em>', html)
-    
-    # Séparateurs
-    html = re.sub(r'^---$', r'<hr>', html, flags=re.MULTILINE)
-    
-    # Paragraphes (lignes non vides)
-    lines = html.split('\n')
+    """
+    Convertir Markdown en HTML.
+
+    Utilise markdown-it-py (CommonMark, tableaux) s'il est installé, sinon
+    le convertisseur basique ci-dessous.
+    """
+    if _MD_PARSER is not None:
+        return _MD_PARSER.render(md_content)
+    return _basic_markdown_to_html(md_content)
+
+
+def _basic_markdown_to_html(md_content: str) -> str:
+    """
+    Convertir Markdown en HTML basique.
+
+    Un seul parcours ligne à ligne : chaque liste (à puces ou numérotée) est
+    fermée dès qu'une ligne n'en fait plus partie, et le contenu des blocs de
+    code est recopié tel quel.
+    """
     result = []
     in_code = False
-    
-    for line in lines:
-        if '<pre>' in line:
+    code_lines: list[str] = []
+    code_lang = ''
+    list_tag = None  # 'ul' ou 'ol' tant qu'une liste est ouverte
+
+    for line in md_content.split('\n'):
+        if in_code:
+            if line.startswith('```'):
+                code = '\n'.join(code_lines)
+                result.append(f'<pre><code class="language-{code_lang}">{code}\n</code></pre>')
+                in_code = False
+            else:
+                code_lines.append(line)
+            continue
+
+        if line.startswith('- '):
+            item_tag, item = 'ul', line[2:]
+        elif ordered := ORDERED_ITEM_RE.match(line):
+            item_tag, item = 'ol', ordered.group(1)
+        else:
+            item_tag = None
+
+        if list_tag and item_tag != list_tag:
+            result.append(f'</{list_tag}>')
+            list_tag = None
+        if item_tag:
+            if not list_tag:
+                result.append(f'<{item_tag}>')
+                list_tag = item_tag
+            result.append(f'<li>{_inline(item)}</li>')
+            continue
+
+        if line.startswith('```'):
             in_code = True
-        if '</pre>' in line:
-            in_code = False
-        
-        if not in_code and line.strip() and not line.strip().startswith('<'):
-            result.append(f'<p>{line}</p>')
+            code_lines = []
+            code_lang = line[3:].strip()
+        elif line.startswith('### '):
+            result.append(f'<h3>{_inline(line[4:])}</h3>')
+        elif line.startswith('## '):
+            result.append(f'<h2>{_inline(line[3:])}</h2>')
+        elif line.startswith('# '):
+            result.append(f'<h1>{_inline(line[2:])}</h1>')
+        elif line == '---':
+            result.append('<hr>')
+        elif line.strip() and not line.strip().startswith('<'):
+            result.append(f'<p>{_inline(line)}</p>')
         else:
             result.append(line)
-    
-    html = '\n'.join(result)
-    
-    return html
 
+    if list_tag:
+        result.append(f'</{list_tag}>')
+    if in_code:
+        # Bloc non fermé : rendu jusqu'à la fin du document
+        result.append(f'<pre><code class="language-{code_lang}">' + '\n'.join(code_lines) + '</code></pre>')
 
-def generate_html():
-    """Générer le HTML à partir du Markdown."""
-    if not MD_FILE.exists():
-        print(f"ERREUR: Fichier Markdown introuvable: {MD_FILE}")
-        return
-    
-    print(f"Lecture du Markdown: {MD_FILE}")
-    with open(MD_FILE, "r", encoding="utf-8") as f:
-        md_content = f.read()
-    
-    html_body = markdown_to_html(md_content)
-    
-    html_template = f"""<!DOCTYPE html>
+    return '\n'.join(result)
+
+
+# Gabarit HTML découpé autour du corps converti, écrit tel quel par generate_html
+HTML_HEAD = """<!DOCTYPE html>
 <html lang="fr">
 <head>
     <meta charset="UTF-8">
     <meta name="viewport" content="width=device-width, initial-scale=1.0">
     <title>Guide Complet de Déploiement IUEC-ERP sur Render</title>
     <style>
-        @page {{
+        @page {
             margin: 2cm;
             size: A4;
-        }}
-        body {{
+        }
+        body {
             font-family: 'Segoe UI', Tahoma, Geneva, Verdana, sans-serif;
             line-height: 1.6;
             color: #333;
@@ -100,42 +136,42 @@ def generate_html():
             margin: 0 auto;
             padding: 20px;
             background: #fff;
-        }}
-        h1 {{
+        }
+        h1 {
             color: #1a1a1a;
             font-size: 28px;
             border-bottom: 3px solid #2c3e50;
             padding-bottom: 10px;
             margin-top: 30px;
             page-break-after: avoid;
-        }}
-        h2 {{
+        }
+        h2 {
             color: #2c3e50;
             font-size: 20px;
             margin-top: 25px;
             margin-bottom: 15px;
             page-break-after: avoid;
-        }}
-        h3 {{
+        }
+        h3 {
             color: #34495e;
             font-size: 16px;
             margin-top: 20px;
             margin-bottom: 10px;
             page-break-after: avoid;
-        }}
-        p {{
+        }
+        p {
             margin: 10px 0;
             text-align: justify;
-        }}
-        code {{
+        }
+        code {
             background: #f4f4f4;
             padding: 2px 6px;
             border-radius: 3px;
             font-family: 'Courier New', monospace;
             font-size: 0.9em;
             color: #c7254e;
-        }}
-        pre {{
+        }
+        pre {
             background: #f8f8f8;
             border: 1px solid #ddd;
             border-left: 4px solid #2c3e50;
@@ -143,55 +179,55 @@ def generate_html():
             overflow-x: auto;
             margin: 15px 0;
             page-break-inside: avoid;
-        }}
-        pre code {{
+        }
+        pre code {
             background: none;
             padding: 0;
             color: #333;
             font-size: 0.85em;
-        }}
-        ul, ol {{
+        }
+        ul, ol {
             margin: 15px 0;
             padding-left: 30px;
-        }}
-        li {{
+        }
+        li {
             margin: 5px 0;
-        }}
-        hr {{
+        }
+        hr {
             border: none;
             border-top: 2px solid #ddd;
             margin: 30px 0;
-        }}
-        strong {{
+        }
+        strong {
             color: #2c3e50;
             font-weight: 600;
-        }}
-        .header {{
+        }
+        .header {
             text-align: center;
             margin-bottom: 40px;
             padding-bottom: 20px;
             border-bottom: 2px solid #2c3e50;
-        }}
-        .header h1 {{
+        }
+        .header h1 {
             border: none;
             margin: 0;
-        }}
-        .meta {{
+        }
+        .meta {
             color: #666;
             font-size: 0.9em;
             margin-top: 10px;
-        }}
-        @media print {{
-            body {{
+        }
+        @media print {
+            body {
                 padding: 0;
-            }}
-            h1, h2, h3 {{
+            }
+            h1, h2, h3 {
                 page-break-after: avoid;
-            }}
-            pre {{
+            }
+            pre {
                 page-break-inside: avoid;
-            }}
-        }}
+            }
+        }
     </style>
 </head>
 <body>
@@ -204,7 +240,9 @@ def generate_html():
         </div>
     </div>
     
-    {html_body}
+    """
+
+HTML_TAIL = """
     
     <hr>
     <div style="text-align: center; color: #666; font-size: 0.9em; margin-top: 40px;">
@@ -213,10 +251,26 @@ def generate_html():
     </div>
 </body>
 </html>"""
+
+
+def generate_html():
+    """Générer le HTML à partir du Markdown."""
+    if not MD_FILE.exists():
+        print(f"ERREUR: Fichier Markdown introuvable: {MD_FILE}")
+        return
+    
+    print(f"Lecture du Markdown: {MD_FILE}")
+    with open(MD_FILE, "r", encoding="utf-8") as f:
+        md_content = f.read()
+    
+    html_body = markdown_to_html(md_content)
     
     print(f"Génération du HTML: {HTML_FILE}")
-    with open(HTML_FILE, "w", encoding="utf-8") as f:
-        f.write(html_template)
+    # Écriture en flux (en-tête, corps, pied) : pas de copie du document entier
+    with open(HTML_FILE, "w", encoding="utf-8", buffering=1024 * 1024) as f:
+        f.write(HTML_HEAD)
+        f.write(html_body)
+        f.write(HTML_TAIL)
     
     print(f"HTML genere avec succes: {HTML_FILE}")
     print("\nPour convertir en PDF:")
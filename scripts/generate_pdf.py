@@ -1,13 +1,21 @@
 #!/usr/bin/env python3
 """
 Script pour générer un PDF à partir du Markdown de déploiement Render.
-Utilise reportlab pour créer un PDF formaté.
+Utilise WeasyPrint sur le HTML de generate_html.py s'il est installé,
+sinon reportlab pour créer un PDF formaté.
 """
 
 import os
+import re
 import sys
 from pathlib import Path
 
+try:
+    from weasyprint import HTML
+except (ImportError, OSError):
+    # OSError : bibliothèques système Pango/cairo absentes
+    HTML = None
+
 try:
     from reportlab.lib.pagesizes import A4
     from reportlab.lib.styles import getSampleStyleSheet, ParagraphStyle
@@ -16,14 +24,17 @@ try:
     from reportlab.lib import colors
     from reportlab.lib.enums import TA_LEFT, TA_CENTER, TA_JUSTIFY
 except ImportError:
-    print("ERREUR: reportlab n'est pas installé.")
-    print("Installez-le avec: pip install reportlab")
-    sys.exit(1)
+    if HTML is None:
+        print("ERREUR: ni weasyprint ni reportlab ne sont installés.")
+        print("Installez l'un des deux avec: pip install weasyprint (ou reportlab)")
+        sys.exit(1)
 
-# Chemins
-BASE_DIR = Path(__file__).parent.parent
-MD_FILE = BASE_DIR / "docs" / "DEPLOIEMENT_RENDER_COMPLET.md"
-PDF_FILE = BASE_DIR / "docs" / "DEPLOIEMENT_RENDER_COMPLET.pdf"
+from _paths import HTML_FILE, MD_FILE, PDF_FILE
+
+# Motifs compilés une fois : élément numéroté, gras, code en ligne
+OL_RE = re.compile(r"(\d+)\. (.*)")
+BOLD_RE = re.compile(r"\*\*(.+?)\*\*")
+CODE_RE = re.compile(r"`([^`]+)`")
 
 
 def read_markdown(file_path: Path) -> str:
@@ -89,8 +100,8 @@ def parse_markdown_to_elements(md_content: str, styles):
             elements.append(Paragraph(f"• {bullet_text}", styles["Normal"]))
         
         # Liste numérotée
-        elif line and line[0].isdigit() and ". " in line[:5]:
-            num, text = line.split(". ", 1)
+        elif ordered := OL_RE.match(line):
+            num, text = ordered.groups()
             elements.append(Paragraph(f"{num}. {text}", styles["Normal"]))
         
         # Ligne vide
@@ -102,8 +113,8 @@ def parse_markdown_to_elements(md_content: str, styles):
             # Échapper HTML pour reportlab
             para_text = line.replace("&", "&amp;").replace("<", "&lt;").replace(">", "&gt;")
             # Formatage basique
-            para_text = para_text.replace("**", "<b>").replace("**", "</b>")
-            para_text = para_text.replace("`", "<font face='Courier' size='9'>").replace("`", "</font>")
+            para_text = BOLD_RE.sub(r"<b>\1</b>", para_text)
+            para_text = CODE_RE.sub(r"<font face='Courier' size='9'>\1</font>", para_text)
             elements.append(Paragraph(para_text, styles["Normal"]))
             elements.append(Spacer(1, 0.05 * inch))
         
@@ -116,12 +127,31 @@ def parse_markdown_to_elements(md_content: str, styles):
     return elements
 
 
+def generate_pdf_from_html():
+    """
+    Générer le PDF à partir du HTML de generate_html.py avec WeasyPrint.
+
+    Le Markdown n'est parsé qu'une fois et la mise en page reprend les règles
+    d'impression du gabarit HTML.
+    """
+    import generate_html
+
+    generate_html.generate_html()
+    print(f"Génération du PDF: {PDF_FILE}")
+    HTML(filename=str(HTML_FILE)).write_pdf(str(PDF_FILE))
+    print(f"✅ PDF généré avec succès: {PDF_FILE}")
+
+
 def generate_pdf():
     """Générer le PDF à partir du Markdown."""
     if not MD_FILE.exists():
         print(f"ERREUR: Fichier Markdown introuvable: {MD_FILE}")
         sys.exit(1)
     
+    if HTML is not None:
+        generate_pdf_from_html()
+        return
+    
     print(f"Lecture du Markdown: {MD_FILE}")
     md_content = read_markdown(MD_FILE)
     